@@ -0,0 +1,117 @@
+"""
+Channel to country mapping for broadcast listings
+Shared by the CLI and the database layer
+"""
+
+import hashlib
+import json
+import sys
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Channel to country mapping
+CHANNEL_COUNTRY_MAP = {
+    # USA/America
+    'NBC': 'USA', 'NBC Sports': 'USA', 'Peacock': 'USA', 'Peacock Premium': 'USA',
+    'USA Network': 'USA', 'Universo': 'USA', 'ESPN': 'USA', 'ESPN+': 'USA',
+    'ESPN Deportes': 'USA', 'CBS Sports': 'USA', 'CBS Sports Network': 'USA',
+    'CBS Sports Golazo Network': 'USA', 'Paramount+': 'USA', 'beIN Sports': 'USA',
+    'beIN Sports USA': 'USA', 'beIN Sports en Español': 'USA',
+    
+    # UK
+    'Sky Sports': 'UK', 'Sky Sports Premier League': 'UK', 'Sky Sports Main Event': 'UK',
+    'Sky Sports Ultra HDR': 'UK', 'Sky Sports 4K': 'UK', 'TNT Sports': 'UK',
+    'TNT Sports 1': 'UK', 'TNT Sports 2': 'UK', 'TNT Sports 3': 'UK', 'TNT Sports 4': 'UK',
+    'LaLigaTV': 'UK', 'Premier Sports': 'UK', 'Premier Sports 1': 'UK', 'Premier Sports 2': 'UK',
+    
+    # Spain
+    'DAZN España': 'Spain', 'DAZN Spain': 'Spain', 'DAZN LaLiga': 'Spain', 'DAZN1 Spain': 'Spain',
+    'Movistar': 'Spain', 'Movistar+': 'Spain', 'Movistar LaLiga': 'Spain',
+    'Movistar+ Deportes': 'Spain', 'Movistar+ Deportes 2': 'Spain',
+    'LaLiga TV Bar': 'Spain',
+    
+    # Germany
+    'Sky Sport': 'Germany', 'Sky Sport Premier League': 'Germany',
+    'DAZN Germany': 'Germany', 'WOW': 'Germany',
+    
+    # Austria
+    'Sky Sport Austria': 'Austria', 'DAZN Austria': 'Austria',
+    
+    # Italy
+    'DAZN Italia': 'Italy',
+    
+    # Portugal
+    'DAZN Portugal': 'Portugal', 'DAZN1 Portugal': 'Portugal',
+    
+    # Albania
+    'SuperSport 2 Digitalb': 'Albania', 'SuperSport 3 Digitalb': 'Albania',
+    'Tring': 'Albania', 'Tring Sport 1': 'Albania',
+    
+    # France
+    'Canal+ France': 'France', 'Canal+ Sport': 'France',
+    
+    # International
+    'Bet365': 'International',
+    'DAZN': 'International',
+}
+
+# Interned so names looked up from other interned strings compare by identity
+CHANNEL_COUNTRY_MAP = {
+    sys.intern(key): sys.intern(country) for key, country in CHANNEL_COUNTRY_MAP.items()
+}
+
+# Changes whenever the mapping does; the database re-maps stored
+# broadcasters when this differs from the one they were mapped with
+CHANNEL_MAP_FINGERPRINT = hashlib.sha1(
+    json.dumps(sorted(CHANNEL_COUNTRY_MAP.items())).encode('utf-8')
+).hexdigest()
+
+# Lowercased once at import; longest keys first so the most specific name
+# wins a substring match ('Sky Sport Austria' before 'Sky Sport')
+_CHANNEL_LOWER = {key.lower(): country for key, country in CHANNEL_COUNTRY_MAP.items()}
+_CHANNEL_LOWER_ITEMS = sorted(_CHANNEL_LOWER.items(), key=lambda kv: -len(kv[0]))
+
+# Optional: with pyahocorasick installed, find every key contained in a
+# name in a single pass instead of testing each key in turn. Values carry
+# the key's position in _CHANNEL_LOWER_ITEMS so the lowest one is the same
+# match the linear scan would return
+if ahocorasick is not None:
+    _CHANNEL_AUTOMATON = ahocorasick.Automaton()
+    for rank, (key, country) in enumerate(_CHANNEL_LOWER_ITEMS):
+        _CHANNEL_AUTOMATON.add_word(key, (rank, country))
+    _CHANNEL_AUTOMATON.make_automaton()
+else:
+    _CHANNEL_AUTOMATON = None
+
+
+@lru_cache(maxsize=2048)
+def get_country_for_channel(channel_name):
+    """Map channel name to country"""
+    if channel_name in CHANNEL_COUNTRY_MAP:
+        return CHANNEL_COUNTRY_MAP[channel_name]
+    
+    name_lower = channel_name.lower()
+    if name_lower in _CHANNEL_LOWER:
+        return _CHANNEL_LOWER[name_lower]
+    
+    if _CHANNEL_AUTOMATON is not None:
+        matches = [value for _, value in _CHANNEL_AUTOMATON.iter(name_lower)]
+        if matches:
+            return min(matches)[1]
+        return 'Various'
+    
+    for key, country in _CHANNEL_LOWER_ITEMS:
+        if key in name_lower:
+            return country
+    
+    return 'Various'
+
+
+def broadcast_country(country, channel):
+    """Country a broadcast is shown under: the channel's own, else the scraped one"""
+    actual_country = get_country_for_channel(channel)
+    return country if actual_country == 'Various' else actual_country
@@ -7,14 +7,33 @@ import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+import lxml.html
+from lxml import etree
+import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import calendar
 import json
-import time
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 import logging
 import warnings
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
 # Suppress the harmless undetected_chromedriver cleanup warning on Windows
 warnings.filterwarnings("ignore", category=ResourceWarning)
 
@@ -24,6 +43,140 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+LEAGUE_URL = "https://www.livesoccertv.com/competitions/{slug}/"
+
+# Resources blocked in the browser - images, fonts and ad/tracking scripts
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+    "*googlesyndication*", "*adservice*",
+]
+
+# Score between team names, e.g. "Arsenal 2 - 1 Chelsea"
+SCORE_RE = re.compile(r'\s+\d+\s*-\s*\d+\s+')
+
+# Date in schedule links, e.g. /schedules/2026-01-17/
+SCHEDULE_DATE_RE = re.compile(r'/schedules/(\d{4}-\d{2}-\d{2})/')
+
+# All supported date formats in a single pattern
+DATE_TEXT_RE = re.compile(
+    r'(?P<dm_day>\d{1,2})\s+(?P<dm_month>[A-Za-z]{3})'                      # "13 Jan", "Mon 13 Jan"
+    r'|(?P<dmy_day>\d{1,2})/(?P<dmy_month>\d{1,2})/(?P<dmy_year>\d{4})'    # "13/01/2026"
+    r'|(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})'    # "2026-01-13"
+)
+
+MONTH_MAP = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4,
+    'may': 5, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Cloudflare challenge page served in place of the requested page
+CF_CHALLENGE_RE = re.compile(
+    r'<title>\s*just a moment|checking your browser|id="challenge-form"', re.I
+)
+
+# Checks a few small DOM signals for the Cloudflare challenge in a single
+# WebDriver round-trip. 'interactive' is enough with the eager page load
+# strategy, and fixture markup means we are past the challenge.
+JS_CHALLENGE_PASSED = r"""
+if (document.readyState === 'loading') {
+    return false;
+}
+if (document.querySelector('tr.matchrow, table.schedules')) {
+    return true;
+}
+if (document.title.startsWith('Just a moment')) {
+    return false;
+}
+return !document.querySelector(
+    '#challenge-form, #challenge-running, iframe[src*="challenges.cloudflare.com"]'
+);
+"""
+
+# Collects the fields of every tr.matchrow in the page, tracking the date
+# from the preceding tr.drow the same way _parse_league_html does
+JS_EXTRACT_MATCH_ROWS = r"""
+const rows = [];
+let currentDate = null;
+let currentParent = null;
+for (const tr of document.querySelectorAll('tr.drow, tr.matchrow')) {
+    if (tr.parentElement !== currentParent) {
+        currentParent = tr.parentElement;
+        currentDate = null;
+    }
+    if (tr.classList.contains('drow')) {
+        const link = tr.querySelector("a[href*='/schedules/']");
+        const m = link && link.getAttribute('href').match(/\/schedules\/(\d{4}-\d{2}-\d{2})\//);
+        currentDate = m ? m[1] : null;
+        continue;
+    }
+    const matchLink = tr.querySelector("a[href*='/match/']");
+    if (!matchLink) {
+        continue;
+    }
+    const time = tr.querySelector('span.ts');
+    rows.push({
+        match: matchLink.textContent.trim(),
+        date: currentDate,
+        time: time ? time.textContent.trim() : null,
+        channels: Array.from(
+            tr.querySelectorAll("td#channels a[href*='/channels/']"),
+            a => a.textContent.trim()
+        ),
+    });
+}
+return rows;
+"""
+
+
+def has_class(*names):
+    """XPath predicate matching elements that have any of the given classes"""
+    return ' or '.join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in names
+    )
+
+
+def element_text(element):
+    """Text content of an lxml element, stripped"""
+    return element.text_content().strip()
+
+
+def first_of(element, *xpaths):
+    """First element found, trying each compiled XPath in order"""
+    for xpath in xpaths:
+        found = xpath(element)
+        if found:
+            return found[0]
+    return None
+
+
+# Compiled once; calling element.xpath() with a string recompiles it every time
+XP_DATE_MATCH_ROWS = etree.XPath(f"//tr[{has_class('drow', 'matchrow')}]")
+XP_SCHEDULE_TABLES = etree.XPath(f"//table[{has_class('schedules')}]")
+XP_TABLE_ROWS = etree.XPath(".//tr")
+XP_MATCH_DIVS = etree.XPath(f"//div[{has_class('match', 'fixture', 'game')}]")
+
+XP_SCHEDULE_HREFS = etree.XPath(".//a[contains(@href, '/schedules/')]/@href")
+XP_MATCH_LINKS = etree.XPath(".//a[contains(@href, '/match/')]")
+XP_TS_SPANS = etree.XPath(f".//span[{has_class('ts')}]")
+XP_CHANNEL_LINKS = etree.XPath("(.//td[@id='channels'])[1]//a[contains(@href, '/channels/')]")
+
+XP_TEAM_LINKS = etree.XPath(".//a[contains(@href, '/teams/')]")
+XP_DATE_TD = etree.XPath(f".//td[{has_class('date')}]")
+XP_DATE_SPAN = etree.XPath(f".//span[{has_class('date')}]")
+XP_TIME_SPAN = etree.XPath(f".//span[{has_class('time')}]")
+XP_TIME_TD = etree.XPath(f".//td[{has_class('time')}]")
+XP_VENUE_SPAN = etree.XPath(f".//span[{has_class('venue')}]")
+XP_VENUE_TD = etree.XPath(f".//td[{has_class('venue')}]")
+XP_BROADCASTER_CELLS = etree.XPath(f".//td[{has_class('broadcaster')}]")
+XP_IMG_ALTS = etree.XPath(".//img/@alt")
+XP_LINKS = etree.XPath(".//a")
+
+XP_TEAM_NAMES = etree.XPath(f".//*[self::span or self::div][{has_class('team', 'team-name')}]")
+XP_DATE_ELEMS = etree.XPath(f".//*[self::span or self::div][{has_class('date', 'match-date')}]")
+
 
 class CloudflareBypassScraper:
     """Scrape LiveSoccerTV with Cloudflare bypass"""
@@ -31,20 +184,28 @@ class CloudflareBypassScraper:
     def __init__(self):
         self.driver = None
         self.fixtures = []
+        self._filtered = None
+        self._filtered_source = None
+        self._filtered_len = 0
+        self.max_workers = 3
+        # Optional: fetch all leagues concurrently with Playwright first
+        self.use_playwright = False
         self.today = date.today()
         # Calculate month range
         self.month_start = self.today.replace(day=1)
-        last_day = 31
-        while True:
-            try:
-                self.month_end = self.today.replace(day=last_day)
-                break
-            except ValueError:
-                last_day -= 1
+        last_day = calendar.monthrange(self.today.year, self.today.month)[1]
+        self.month_end = self.today.replace(day=last_day)
+        
+        # ISO date strings order the same as dates, so fixtures are
+        # range-checked without parsing their dates back
+        self._month_start_s = self.month_start.isoformat()
+        self._month_end_s = self.month_end.isoformat()
         
         logger.info(f"Scraping fixtures from {self.month_start} to {self.month_end}")
         
         self.target_countries = ['USA', 'AMERICA', 'SPAIN', 'GERMANY', 'AUSTRIA', 'ALBANIA', 'UK']
+        self._target_upper = tuple(t.upper() for t in self.target_countries)
+        self._target_upper_set = frozenset(self._target_upper)
         self.leagues = {
             'england/premier-league': 'Premier League',
             'italy/serie-a': 'Serie A',
@@ -54,22 +215,48 @@ class CloudflareBypassScraper:
             'international/uefa-champions-league/': 'UEFA Champions League',
         }
     
+    def _create_driver(self):
+        """Create an undetected Chrome driver configured for scraping"""
+        options = uc.ChromeOptions()
+        
+        # Basic options
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--window-size=1920,1080')
+        
+        # Keep logging and extensions out of the WebDriver round-trips
+        options.add_argument('--log-level=3')
+        options.add_argument('--disable-logging')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        
+        # Return from get() at DOMContentLoaded; the fixtures table is in the
+        # initial HTML, so there is no need to wait for ads and trackers
+        options.page_load_strategy = 'eager'
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+        
+        # Optional: Run headless (may not work with all Cloudflare challenges)
+        # options.add_argument('--headless=new')
+        
+        # Initialize undetected chromedriver
+        driver = uc.Chrome(options=options, version_main=143)
+        
+        # All waits are explicit; an implicit wait would stall every empty lookup
+        driver.implicitly_wait(0)
+        
+        # Skip downloading resources we never parse
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        
+        return driver
+    
     def setup_driver(self):
         """Set up undetected Chrome driver to bypass Cloudflare"""
         try:
-            options = uc.ChromeOptions()
-            
-            # Basic options
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--window-size=1920,1080')
-            
-            # Optional: Run headless (may not work with all Cloudflare challenges)
-            # options.add_argument('--headless=new')
-            
-            # Initialize undetected chromedriver
-            self.driver = uc.Chrome(options=options, version_main=143)
+            self.driver = self._create_driver()
             
             logger.info("Undetected Chrome driver initialized successfully")
             logger.info("This driver can bypass Cloudflare protection")
@@ -79,232 +266,282 @@ class CloudflareBypassScraper:
             logger.error(f"Error setting up Chrome driver: {e}")
             return False
     
-    def wait_for_cloudflare(self, timeout=30):
+    def wait_for_cloudflare(self, timeout=30, driver=None):
         """Wait for Cloudflare challenge to complete"""
         logger.info("Waiting for Cloudflare challenge to complete...")
-        time.sleep(5)  # Initial wait
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            page_source = self.driver.page_source.lower()
-            
-            # Check if Cloudflare challenge is present
-            if 'cloudflare' in page_source and ('checking your browser' in page_source or 'just a moment' in page_source):
-                logger.info("Cloudflare challenge detected, waiting...")
-                time.sleep(2)
-            else:
-                logger.info("✓ Cloudflare challenge passed!")
-                return True
         
-        logger.warning("Cloudflare challenge timeout")
-        return False
+        try:
+            WebDriverWait(
+                driver or self.driver, timeout, poll_frequency=0.25,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(lambda d: d.execute_script(JS_CHALLENGE_PASSED))
+            logger.info("✓ Cloudflare challenge passed!")
+            return True
+        except TimeoutException:
+            logger.warning("Cloudflare challenge timeout")
+            return False
     
-    def scrape_league(self, league_slug: str, league_name: str):
-        """Scrape fixtures from a specific league"""
-        url = f"https://www.livesoccertv.com/competitions/{league_slug}/"
+    def scrape_league(self, league_slug: str, league_name: str, driver=None):
+        """
+        Scrape fixtures from a specific league
+        
+        Args:
+            league_slug: Competition path on LiveSoccerTV
+            league_name: Display name stored with each fixture
+            driver: Browser to use, defaults to self.driver
+        
+        Returns:
+            List of fixtures found for the league
+        """
+        driver = driver or self.driver
+        url = LEAGUE_URL.format(slug=league_slug)
         logger.info(f"\nScraping {league_name} from: {url}")
         
+        fixtures = []
+        # One timestamp for the whole page; scraped_at marks the batch
+        scraped_at = datetime.now().isoformat()
+        
         try:
-            self.driver.get(url)
-            
-            # Wait for Cloudflare
-            self.wait_for_cloudflare()
-            
-            # Reduced wait for page load (optimized)
-            time.sleep(1.5)
+            driver.get(url)
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
+            # Returns once the fixture table is in the DOM or the challenge
+            # has cleared on a parsed page; the table is server-rendered,
+            # so there is nothing further to wait for
+            self.wait_for_cloudflare(driver=driver)
             
             # Debug: Save page source to check structure (disabled for performance)
             # with open(f'output/debug_{league_name.replace(" ", "_")}.html', 'w', encoding='utf-8') as f:
-            #     f.write(self.driver.page_source)
+            #     f.write(driver.page_source)
             # logger.info(f"Saved debug HTML to output/debug_{league_name.replace(' ', '_')}.html")
             
-            # Look for different possible fixture containers
-            fixtures_found = 0
-            
-            # Method 1: Look for match rows (tr with class matchrow)
-            match_rows = soup.find_all('tr', class_='matchrow')
+            # Extract match rows inside the browser so only their fields cross
+            # the WebDriver connection, not the whole serialized page
+            match_rows = driver.execute_script(JS_EXTRACT_MATCH_ROWS) or []
             logger.info(f"Found {len(match_rows)} match rows")
             
             for row in match_rows:
-                fixture_data = self._parse_match_row(row, league_name)
+                fixture_data = self._build_match_fixture(
+                    league_name, row['match'], row['date'], row['time'], row['channels'],
+                    scraped_at
+                )
                 if fixture_data:
-                    self.fixtures.append(fixture_data)
-                    fixtures_found += 1
+                    fixtures.append(fixture_data)
             
-            # Method 2: Look for schedule tables (fallback)
-            if fixtures_found == 0:
-                tables = soup.find_all('table', class_='schedules')
-                logger.info(f"Found {len(tables)} schedule tables")
-                
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        fixture_data = self._parse_fixture_row(row, league_name)
-                        if fixture_data:
-                            self.fixtures.append(fixture_data)
-                            fixtures_found += 1
-            
-            # Method 3: Look for match items in divs
-            if fixtures_found == 0:
-                match_divs = soup.find_all('div', class_=['match', 'fixture', 'game'])
-                logger.info(f"Found {len(match_divs)} match divs")
-                
-                for div in match_divs:
-                    fixture_data = self._parse_fixture_div(div, league_name)
-                    if fixture_data:
-                        self.fixtures.append(fixture_data)
-                        fixtures_found += 1
+            # Other page layouts still need the full HTML
+            if not fixtures:
+                fixtures = self._parse_league_html(driver.page_source, league_name, scraped_at)
             
-            logger.info(f"✓ Found {fixtures_found} fixtures for {league_name}")
+            logger.info(f"✓ Found {len(fixtures)} fixtures for {league_name}")
             
         except Exception as e:
             logger.error(f"Error scraping {league_name}: {e}")
+        
+        return fixtures
+    
+    def _parse_league_html(self, html, league_name, scraped_at=None):
+        """Extract fixtures from a league page's HTML"""
+        scraped_at = scraped_at or datetime.now().isoformat()
+        if not html:
+            return []
+        
+        tree = lxml.html.fromstring(html)
+        fixtures = []
+        
+        # Look for different possible fixture containers
+        
+        # Method 1: Look for match rows (tr with class matchrow)
+        # Date rows (tr.drow) precede their matches, so a single pass in
+        # document order tracks the current date for each match row
+        match_rows = 0
+        current_date = None
+        current_parent = None
+        
+        for row in XP_DATE_MATCH_ROWS(tree):
+            if row.getparent() is not current_parent:
+                # Dates never carry over into another table
+                current_parent = row.getparent()
+                current_date = None
+            
+            if 'drow' in row.get('class', '').split():
+                current_date = self._parse_date_row(row)
+                continue
+            
+            match_rows += 1
+            fixture_data = self._parse_match_row(row, league_name, scraped_at, current_date)
+            if fixture_data:
+                fixtures.append(fixture_data)
+        
+        logger.info(f"Found {match_rows} match rows")
+        
+        # Method 2: Look for schedule tables (fallback)
+        if not fixtures:
+            tables = XP_SCHEDULE_TABLES(tree)
+            logger.info(f"Found {len(tables)} schedule tables")
+            
+            for table in tables:
+                rows = XP_TABLE_ROWS(table)
+                for row in rows:
+                    fixture_data = self._parse_fixture_row(row, league_name, scraped_at)
+                    if fixture_data:
+                        fixtures.append(fixture_data)
+        
+        # Method 3: Look for match items in divs
+        if not fixtures:
+            match_divs = XP_MATCH_DIVS(tree)
+            logger.info(f"Found {len(match_divs)} match divs")
+            
+            for div in match_divs:
+                fixture_data = self._parse_fixture_div(div, league_name, scraped_at)
+                if fixture_data:
+                    fixtures.append(fixture_data)
+        
+        return fixtures
+    
+    def _parse_date_row(self, row):
+        """Get the ISO date from a date row with class='drow', or None"""
+        hrefs = XP_SCHEDULE_HREFS(row)
+        if hrefs:
+            # Extract date from URL like /schedules/2026-01-17/
+            date_match = SCHEDULE_DATE_RE.search(hrefs[0])
+            if date_match:
+                return date_match.group(1)
+        return None
     
-    def _parse_match_row(self, row, league_name):
+    def _parse_match_row(self, row, league_name, scraped_at, fixture_date=None):
         """Parse a match row with class='matchrow' from LiveSoccerTV"""
         try:
             # Extract match link
-            match_link = row.find('a', href=lambda x: x and '/match/' in str(x))
-            if not match_link:
+            match_links = XP_MATCH_LINKS(row)
+            if not match_links:
                 return None
             
-            match_text = match_link.get_text(strip=True)
-            
-            # Parse teams from match text (format: "Team1 vs Team2" or "Team1 0-1 Team2")
-            # Remove score if present
-            score_pattern = r'\s+\d+\s*-\s*\d+\s+'
-            match_text_clean = re.sub(score_pattern, ' vs ', match_text)
-            
-            if ' vs ' not in match_text_clean:
-                return None
-            
-            teams = match_text_clean.split(' vs ')
-            if len(teams) != 2:
-                return None
-            
-            home_team = teams[0].strip()
-            away_team = teams[1].strip()
-            
-            # Extract date from date row (previous sibling tr with class drow)
-            fixture_date = str(self.today)
-            date_row = row.find_previous_sibling('tr', class_='drow')
-            if date_row:
-                date_link = date_row.find('a', href=lambda x: x and '/schedules/' in str(x))
-                if date_link:
-                    href = date_link.get('href')
-                    # Extract date from URL like /schedules/2026-01-17/
-                    date_match = re.search(r'/schedules/(\d{4}-\d{2}-\d{2})/', href)
-                    if date_match:
-                        fixture_date = date_match.group(1)
-            
             # Extract time
-            time_span = row.find('span', class_='ts')
-            fixture_time = 'TBD'
-            if time_span:
-                fixture_time = time_span.get_text(strip=True)
-            
-            # Extract broadcasters
-            broadcasters = []
-            channels_td = row.find('td', id='channels')
-            if channels_td:
-                channel_links = channels_td.find_all('a', href=lambda x: x and '/channels/' in str(x))
-                for link in channel_links:
-                    channel_name = link.get_text(strip=True)
-                    # Try to find country from channel name or class
-                    # For now, we'll mark as 'Various' and filter later based on known channels
-                    if channel_name and len(channel_name) > 1:
-                        broadcasters.append({
-                            'country': 'Various',  # Will be enhanced with country mapping
-                            'channel': channel_name
-                        })
+            time_spans = XP_TS_SPANS(row)
+            fixture_time = element_text(time_spans[0]) if time_spans else None
             
-            fixture = {
-                'home_team': home_team,
-                'away_team': away_team,
-                'competition': league_name,
-                'date': fixture_date,
-                'time': fixture_time,
-                'broadcasters': broadcasters,
-                'scraped_at': datetime.now().isoformat()
-            }
+            # Extract broadcaster channel names
+            channel_links = XP_CHANNEL_LINKS(row)
+            channel_names = [element_text(link) for link in channel_links]
             
-            # Check if within month range
-            fixture_date_obj = datetime.strptime(fixture_date, '%Y-%m-%d').date()
-            if self.month_start <= fixture_date_obj <= self.month_end:
-                return fixture
-            
-            return None
+            return self._build_match_fixture(
+                league_name, element_text(match_links[0]),
+                fixture_date, fixture_time, channel_names, scraped_at
+            )
             
         except Exception as e:
             logger.debug(f"Error parsing match row: {e}")
             return None
     
-    def _parse_fixture_row(self, row, league_name):
+    def _build_match_fixture(self, league_name, match_text, fixture_date, fixture_time,
+                             channel_names, scraped_at):
+        """Build a fixture from the fields of a match row, or None if it is unusable"""
+        # Parse teams from match text (format: "Team1 vs Team2" or "Team1 0-1 Team2")
+        # Remove score if present
+        match_text_clean = SCORE_RE.sub(' vs ', match_text)
+        
+        if ' vs ' not in match_text_clean:
+            return None
+        
+        teams = match_text_clean.split(' vs ')
+        if len(teams) != 2:
+            return None
+        
+        home_team = teams[0].strip()
+        away_team = teams[1].strip()
+        
+        # Date comes from the preceding date row, if any
+        if not fixture_date:
+            fixture_date = str(self.today)
+        
+        # Try to find country from channel name or class
+        # For now, we'll mark as 'Various' and filter later based on known channels
+        broadcasters = [
+            {
+                'country': 'Various',  # Will be enhanced with country mapping
+                'channel': channel_name
+            }
+            for channel_name in channel_names
+            if channel_name and len(channel_name) > 1
+        ]
+        
+        fixture = {
+            'home_team': home_team,
+            'away_team': away_team,
+            'competition': league_name,
+            'date': fixture_date,
+            'time': fixture_time or 'TBD',
+            'broadcasters': broadcasters,
+            'scraped_at': scraped_at
+        }
+        
+        # Check if within month range
+        if self._month_start_s <= fixture_date <= self._month_end_s:
+            return fixture
+        
+        return None
+    
+    def _parse_fixture_row(self, row, league_name, scraped_at):
         """Parse a single fixture row from table"""
         try:
             # Look for team links
-            team_links = row.find_all('a', href=lambda x: x and '/teams/' in str(x))
+            team_links = XP_TEAM_LINKS(row)
             
             if len(team_links) < 2:
                 return None
             
             # Extract date - look for date cell
-            date_cell = row.find('td', class_='date') or row.find('span', class_='date')
+            date_cell = first_of(row, XP_DATE_TD, XP_DATE_SPAN)
             fixture_date = str(self.today)  # default
             
-            if date_cell:
-                date_text = date_cell.get_text(strip=True)
+            if date_cell is not None:
+                date_text = element_text(date_cell)
                 parsed_date = self._parse_date_text(date_text)
                 if parsed_date:
                     fixture_date = str(parsed_date)
             
             fixture = {
-                'home_team': team_links[0].get_text(strip=True),
-                'away_team': team_links[1].get_text(strip=True),
+                'home_team': element_text(team_links[0]),
+                'away_team': element_text(team_links[1]),
                 'competition': league_name,
                 'date': fixture_date,
                 'broadcasters': []
             }
             
             # Extract time
-            time_elem = row.find('span', class_='time') or row.find('td', class_='time')
-            if time_elem:
-                fixture['time'] = time_elem.get_text(strip=True)
+            time_elem = first_of(row, XP_TIME_SPAN, XP_TIME_TD)
+            if time_elem is not None:
+                fixture['time'] = element_text(time_elem)
             else:
                 fixture['time'] = 'TBD'
             
             # Extract venue if available
-            venue_elem = row.find('span', class_='venue') or row.find('td', class_='venue')
-            if venue_elem:
-                fixture['venue'] = venue_elem.get_text(strip=True)
+            venue_elem = first_of(row, XP_VENUE_SPAN, XP_VENUE_TD)
+            if venue_elem is not None:
+                fixture['venue'] = element_text(venue_elem)
             
             # Extract broadcasters
-            broadcaster_cells = row.find_all('td', class_='broadcaster')
+            broadcaster_cells = XP_BROADCASTER_CELLS(row)
             
             for cell in broadcaster_cells:
                 # Get country from flag image
-                country_img = cell.find('img', alt=True)
-                country = country_img.get('alt', 'Unknown') if country_img else 'Various'
+                country_alts = XP_IMG_ALTS(cell)
+                country = country_alts[0] if country_alts else 'Various'
                 
                 # Get channel names
-                channel_links = cell.find_all('a')
+                channel_links = XP_LINKS(cell)
                 for link in channel_links:
-                    channel_name = link.get_text(strip=True)
+                    channel_name = element_text(link)
                     if channel_name and len(channel_name) > 1:
                         fixture['broadcasters'].append({
                             'country': country,
                             'channel': channel_name
                         })
             
-            fixture['scraped_at'] = datetime.now().isoformat()
+            fixture['scraped_at'] = scraped_at
             
             if fixture['home_team'] and fixture['away_team']:
                 # Only include fixtures within the current month
-                fixture_date_obj = datetime.strptime(fixture_date, '%Y-%m-%d').date()
-                if self.month_start <= fixture_date_obj <= self.month_end:
+                if self._month_start_s <= fixture_date <= self._month_end_s:
                     return fixture
             
             return None
@@ -327,40 +564,20 @@ class CloudflareBypassScraper:
             if 'tomorrow' in date_text.lower():
                 return self.today + timedelta(days=1)
             
-            # Handle relative dates like "Mon 13 Jan"
-            current_year = self.today.year
-            
-            # Try parsing formats like "Mon 13 Jan" or "13 Jan"
-            patterns = [
-                r'(\d{1,2})\s+([A-Za-z]{3})',  # "13 Jan"
-                r'[A-Za-z]{3}\s+(\d{1,2})\s+([A-Za-z]{3})',  # "Mon 13 Jan"
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',  # "13/01/2026"
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',  # "2026-01-13"
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    groups = match.groups()
-                    if len(groups) == 2:
-                        # Day and month abbreviation
-                        day = int(groups[0])
-                        month_abbr = groups[1]
-                        month_map = {
-                            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4,
-                            'may': 5, 'jun': 6, 'jul': 7, 'aug': 8,
-                            'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                        }
-                        month = month_map.get(month_abbr.lower()[:3])
-                        if month:
-                            return date(current_year, month, day)
-                    elif len(groups) == 3:
-                        # Full date
-                        if '/' in date_text:
-                            day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                        else:
-                            year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                        return date(year, month, day)
+            # Handle "Mon 13 Jan", "13 Jan", "13/01/2026" and "2026-01-13"
+            match = DATE_TEXT_RE.search(date_text)
+            if match:
+                if match.group('dm_day'):
+                    # Day and month abbreviation
+                    month = MONTH_MAP.get(match.group('dm_month').lower())
+                    if month:
+                        return date(self.today.year, month, int(match.group('dm_day')))
+                elif match.group('dmy_day'):
+                    return date(int(match.group('dmy_year')), int(match.group('dmy_month')),
+                                int(match.group('dmy_day')))
+                else:
+                    return date(int(match.group('iso_year')), int(match.group('iso_month')),
+                                int(match.group('iso_day')))
             
             return None
             
@@ -368,35 +585,34 @@ class CloudflareBypassScraper:
             logger.debug(f"Error parsing date '{date_text}': {e}")
             return None
     
-    def _parse_fixture_div(self, div, league_name):
+    def _parse_fixture_div(self, div, league_name, scraped_at):
         """Parse fixture from div element"""
         try:
-            teams = div.find_all(['span', 'div'], class_=['team', 'team-name'])
+            teams = XP_TEAM_NAMES(div)
             
             if len(teams) < 2:
                 return None
             
             # Try to extract date
-            date_elem = div.find(['span', 'div'], class_=['date', 'match-date'])
+            date_elems = XP_DATE_ELEMS(div)
             fixture_date = str(self.today)
-            if date_elem:
-                parsed_date = self._parse_date_text(date_elem.get_text(strip=True))
+            if date_elems:
+                parsed_date = self._parse_date_text(element_text(date_elems[0]))
                 if parsed_date:
                     fixture_date = str(parsed_date)
             
             fixture = {
-                'home_team': teams[0].get_text(strip=True),
-                'away_team': teams[1].get_text(strip=True),
+                'home_team': element_text(teams[0]),
+                'away_team': element_text(teams[1]),
                 'competition': league_name,
                 'date': fixture_date,
                 'time': 'TBD',
                 'broadcasters': [],
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': scraped_at
             }
             
             # Check if within month range
-            fixture_date_obj = datetime.strptime(fixture_date, '%Y-%m-%d').date()
-            if self.month_start <= fixture_date_obj <= self.month_end:
+            if self._month_start_s <= fixture_date <= self._month_end_s:
                 return fixture if fixture['home_team'] and fixture['away_team'] else None
             
             return None
@@ -408,7 +624,7 @@ class CloudflareBypassScraper:
     def _parse_from_link(self, link, league_name):
         """Parse basic fixture info from match link"""
         try:
-            text = link.get_text(strip=True)
+            text = element_text(link)
             if ' vs ' in text or ' v ' in text:
                 parts = text.split(' vs ' if ' vs ' in text else ' v ')
                 if len(parts) == 2:
@@ -426,58 +642,264 @@ class CloudflareBypassScraper:
             logger.debug(f"Error parsing link: {e}")
             return None
     
+    def _create_http_session(self, driver=None):
+        """Create a requests session that reuses the browser's Cloudflare clearance"""
+        driver = driver or self.driver
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        # cf_clearance is bound to the user agent that solved the challenge
+        session.headers.update({
+            'User-Agent': driver.execute_script("return navigator.userAgent"),
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+        
+        return session
+    
+    def scrape_league_http(self, session, league_slug: str, league_name: str):
+        """
+        Scrape a league over plain HTTP, without rendering it in the browser
+        
+        Returns:
+            List of fixtures, or None if the page could not be fetched or
+            parsed (e.g. Cloudflare blocked the request)
+        """
+        url = LEAGUE_URL.format(slug=league_slug)
+        logger.info(f"\nScraping {league_name} over HTTP from: {url}")
+        
+        scraped_at = datetime.now().isoformat()
+        
+        try:
+            response = session.get(url, timeout=30)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP request failed for {league_name}: {e}")
+            return None
+        
+        if response.status_code in (403, 503):
+            logger.info(f"Cloudflare blocked HTTP fetch for {league_name} ({response.status_code})")
+            return None
+        
+        # Challenge markers sit in the head, so only the start of the page is scanned
+        if CF_CHALLENGE_RE.search(response.text, 0, 16384):
+            logger.info(f"Cloudflare served a challenge page for {league_name}")
+            return None
+        
+        # An empty or malformed body shouldn't take the other leagues down
+        # with it; let the browser have a go instead
+        try:
+            fixtures = self._parse_league_html(response.text, league_name, scraped_at)
+        except Exception as e:
+            logger.warning(f"Could not parse HTTP response for {league_name}: {e}")
+            return None
+        
+        logger.info(f"✓ Found {len(fixtures)} fixtures for {league_name}")
+        return fixtures
+    
+    async def _scrape_league_async(self, context, league_slug, league_name):
+        """
+        Scrape a league in a Playwright page
+        
+        Returns:
+            List of fixtures, or None if Cloudflare served a challenge
+        """
+        url = LEAGUE_URL.format(slug=league_slug)
+        logger.info(f"\nScraping {league_name} with Playwright from: {url}")
+        
+        scraped_at = datetime.now().isoformat()
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until='domcontentloaded')
+            html = await page.content()
+        finally:
+            await page.close()
+        
+        if CF_CHALLENGE_RE.search(html, 0, 16384):
+            logger.info(f"Cloudflare served a challenge page for {league_name}")
+            return None
+        
+        fixtures = self._parse_league_html(html, league_name, scraped_at)
+        logger.info(f"✓ Found {len(fixtures)} fixtures for {league_name}")
+        return fixtures
+    
+    async def scrape_all_async(self, leagues):
+        """
+        Fetch leagues concurrently in one Playwright browser
+        
+        Returns:
+            List of (league, fixtures) pairs; fixtures is None for leagues
+            that could not be scraped
+        """
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=False)
+            try:
+                context = await browser.new_context()
+                results = await asyncio.gather(
+                    *(self._scrape_league_async(context, *league) for league in leagues),
+                    return_exceptions=True
+                )
+            finally:
+                await browser.close()
+        
+        pairs = []
+        for league, result in zip(leagues, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Playwright failed for {league[1]}: {result}")
+                result = None
+            pairs.append((league, result))
+        return pairs
+    
     def scrape_all_leagues(self):
         """Scrape all configured leagues"""
+        leagues = list(self.leagues.items())
+        if not leagues:
+            return False
+        
+        if self.use_playwright:
+            if async_playwright is None:
+                logger.warning("Playwright is not installed, using undetected-chromedriver")
+            else:
+                remaining = []
+                for league, fixtures in asyncio.run(self.scrape_all_async(leagues)):
+                    if fixtures is None:
+                        remaining.append(league)
+                    else:
+                        self.fixtures.extend(fixtures)
+                
+                # undetected-chromedriver only handles what Cloudflare blocked
+                leagues = remaining
+                if not leagues:
+                    return len(self.fixtures) > 0
+        
         if not self.driver:
             if not self.setup_driver():
                 logger.error("Failed to setup driver, cannot continue")
-                return False
+                return len(self.fixtures) > 0
+        
+        # The first league goes through the browser to clear Cloudflare; the
+        # rest reuse its cookies over plain HTTP
+        self.fixtures.extend(self.scrape_league(*leagues[0]))
+        try:
+            session = self._create_http_session()
+        except Exception as e:
+            logger.warning(f"Could not reuse browser cookies, using the browser only: {e}")
+            session = None
+        
+        # Browsers for leagues that HTTP cannot fetch. Each worker needs its
+        # own session since WebDriver commands on one session are serialized.
+        # Drivers are created one at a time because undetected-chromedriver
+        # patches its binary on startup.
+        workers = max(1, min(self.max_workers, len(leagues) - 1))
+        drivers = [self.driver]
+        pool = queue.Queue()
+        pool.put(self.driver)
+        driver_lock = threading.Lock()
         
-        for league_slug, league_name in self.leagues.items():
-            self.scrape_league(league_slug, league_name)
-            time.sleep(1)  # Wait between requests (optimized)
+        def acquire_driver():
+            try:
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
+            with driver_lock:
+                if len(drivers) < workers:
+                    try:
+                        driver = self._create_driver()
+                        drivers.append(driver)
+                        return driver
+                    except Exception as e:
+                        logger.warning(f"Could not start extra browser: {e}")
+            return pool.get()
+        
+        def scrape(league):
+            fixtures = self.scrape_league_http(session, *league) if session else None
+            if fixtures is not None:
+                return fixtures
+            
+            driver = acquire_driver()
+            try:
+                return self.scrape_league(*league, driver=driver)
+            finally:
+                pool.put(driver)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for league_fixtures in executor.map(scrape, leagues[1:]):
+                    self.fixtures.extend(league_fixtures)
+        finally:
+            if session:
+                session.close()
+            for driver in drivers[1:]:
+                self._quit_driver(driver)
         
         return len(self.fixtures) > 0
     
+    def _is_target_country(self, country):
+        """Check an uppercased country name against the target countries"""
+        if country in self._target_upper_set:
+            return True
+        return any(target in country or country in target for target in self._target_upper)
+    
     def filter_by_target_countries(self):
         """Filter fixtures to only include target countries"""
+        # self.fixtures only ever grows, so the same list with an unchanged
+        # length means the cached result is still valid
+        if (self._filtered is not None and self._filtered_source is self.fixtures
+                and self._filtered_len == len(self.fixtures)):
+            return self._filtered
+        
         filtered_fixtures = []
         
         for fixture in self.fixtures:
-            filtered_broadcasters = []
-            for bc in fixture.get('broadcasters', []):
-                country = bc.get('country', '').upper()
-                if any(target.upper() in country or country in target.upper() for target in self.target_countries):
-                    filtered_broadcasters.append(bc)
+            broadcasters = fixture.get('broadcasters')
+            if not broadcasters:
+                # Include fixtures without broadcaster info
+                filtered_fixtures.append(fixture)
+                continue
             
-            if filtered_broadcasters:
+            filtered_broadcasters = [
+                bc for bc in broadcasters
+                if self._is_target_country(bc.get('country', '').upper())
+            ]
+            
+            if len(filtered_broadcasters) == len(broadcasters):
+                filtered_fixtures.append(fixture)
+            elif filtered_broadcasters:
                 fixture_copy = fixture.copy()
                 fixture_copy['broadcasters'] = filtered_broadcasters
                 filtered_fixtures.append(fixture_copy)
-            elif not fixture.get('broadcasters'):
-                # Include fixtures without broadcaster info
-                filtered_fixtures.append(fixture.copy())
         
+        self._filtered = filtered_fixtures
+        self._filtered_source = self.fixtures
+        self._filtered_len = len(self.fixtures)
         return filtered_fixtures
     
-    def save_to_json(self, filename='cloudflare_bypass_fixtures.json'):
+    def save_to_json(self, filename='cloudflare_bypass_fixtures.json', filtered=None):
         """Save filtered fixtures to JSON"""
         import os
         os.makedirs('output', exist_ok=True)
         filepath = f'output/{filename}'
         
-        filtered_data = self.filter_by_target_countries()
+        filtered_data = filtered if filtered is not None else self.filter_by_target_countries()
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(filtered_data, option=orjson.OPT_INDENT_2))
+        else:
+            # Indenting is only a readability aid, skip it on the slow path
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(filtered_data, f, ensure_ascii=False)
         
         logger.info(f"\n✓ Saved {len(filtered_data)} fixtures to {filepath}")
         
         return filtered_data
     
-    def print_summary(self):
+    def print_summary(self, filtered=None):
         """Print summary of scraped data"""
-        filtered = self.filter_by_target_countries()
+        if filtered is None:
+            filtered = self.filter_by_target_countries()
         
         logger.info("\n" + "="*80)
         logger.info(f"SCRAPING RESULTS - {self.month_start.strftime('%B %Y')}")
@@ -488,35 +910,36 @@ class CloudflareBypassScraper:
         
         if filtered:
             # Count by league
-            for league_name in set([f['competition'] for f in filtered]):
-                count = len([f for f in filtered if f['competition'] == league_name])
+            league_counts = Counter(f['competition'] for f in filtered)
+            for league_name, count in league_counts.most_common():
                 logger.info(f"  {league_name}: {count} fixtures")
             
             # Count by country
-            country_counts = {}
+            country_counts = Counter()
             for fixture in filtered:
-                for bc in fixture.get('broadcasters', []):
-                    country = bc['country']
-                    country_counts[country] = country_counts.get(country, 0) + 1
+                country_counts.update(bc['country'] for bc in fixture.get('broadcasters', []))
             
             if country_counts:
                 logger.info(f"\nBroadcasts by target country:")
-                for country in sorted(country_counts.keys()):
-                    logger.info(f"  {country}: {country_counts[country]} broadcasts")
+                for country, count in sorted(country_counts.items()):
+                    logger.info(f"  {country}: {count} broadcasts")
         
         logger.info("="*80 + "\n")
     
+    def _quit_driver(self, driver):
+        """Quit a browser, ignoring cleanup errors"""
+        try:
+            driver.quit()
+        except Exception as e:
+            # Suppress harmless cleanup errors
+            logger.debug(f"Browser cleanup error (can be ignored): {e}")
+    
     def close(self):
         """Close the browser"""
         if self.driver:
-            try:
-                self.driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                # Suppress harmless cleanup errors
-                logger.debug(f"Browser cleanup error (can be ignored): {e}")
-            finally:
-                self.driver = None
+            self._quit_driver(self.driver)
+            self.driver = None
+            logger.info("Browser closed")
 
 
 def main():
@@ -538,11 +961,14 @@ def main():
         success = scraper.scrape_all_leagues()
         
         if success and scraper.fixtures:
+            # Filter once for both the summary and the JSON output
+            filtered = scraper.filter_by_target_countries()
+            
             # Print summary
-            scraper.print_summary()
+            scraper.print_summary(filtered)
             
             # Save to JSON
-            scraper.save_to_json()
+            scraper.save_to_json(filtered=filtered)
             
             logger.info("✓ Scraping completed successfully!")
             logger.info("  Check the output folder for results and debug HTML files")
@@ -4,9 +4,19 @@ Stores scraped data in SQLite database to avoid continuous scraping
 """
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, date
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
 import json
 import logging
+import os
+import queue
+import sys
+import threading
+
+from channel_map import CHANNEL_MAP_FINGERPRINT, broadcast_country
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,48 +24,475 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Plain INTEGER PRIMARY KEY: ids still grow monotonically, without the
+# sqlite_sequence bookkeeping AUTOINCREMENT adds to every insert
+_SQL_CREATE_FIXTURES = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        home_team TEXT NOT NULL,
+        away_team TEXT NOT NULL,
+        competition TEXT NOT NULL,
+        fixture_date DATE NOT NULL,
+        fixture_time TEXT,
+        venue TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(home_team, away_team, competition, fixture_date)
+    )
+'''
+
+_FIXTURE_TABLE_COLS = (
+    'id, home_team, away_team, competition, fixture_date, '
+    'fixture_time, venue, scraped_at, last_updated'
+)
+
+# Statements are kept as module constants so the connection's statement
+# cache reuses the compiled form instead of re-preparing on every call
+_SQL_SELECT_FIXTURE_ID = '''
+    SELECT id FROM fixtures 
+    WHERE home_team = ? AND away_team = ? 
+    AND competition = ? AND fixture_date = ?
+'''
+
+_SQL_UPSERT_FIXTURE = '''
+    INSERT INTO fixtures (home_team, away_team, competition, 
+                        fixture_date, fixture_time, venue, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(home_team, away_team, competition, fixture_date)
+    DO UPDATE SET
+        fixture_time = excluded.fixture_time,
+        venue = excluded.venue,
+        last_updated = CURRENT_TIMESTAMP
+'''
+
+# RETURNING (SQLite 3.35+) hands back the row id from the upsert itself,
+# whether it inserted or took the DO UPDATE branch
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_SQL_UPSERT_FIXTURE_RETURNING = _SQL_UPSERT_FIXTURE + '    RETURNING id\n'
+
+_SQL_COUNT_FIXTURES = 'SELECT COUNT(*) as count FROM fixtures'
+
+_SQL_SELECT_FIXTURE_IDS_FOR_DATES = '''
+    SELECT id, home_team, away_team, competition, fixture_date
+    FROM fixtures
+    WHERE fixture_date IN ({placeholders})
+'''
+
+_SQL_SELECT_BCAST_FOR = '''
+    SELECT fixture_id, country, channel FROM broadcasters
+    WHERE fixture_id IN ({placeholders})
+'''
+
+_SQL_DELETE_BCAST = '''
+    DELETE FROM broadcasters
+    WHERE fixture_id = ? AND country = ? AND channel = ?
+'''
+
+# Broadcasters for a whole listing in one statement; the ids are bound as
+# a single JSON array so the SQL text stays the same for any number of them.
+# Served entirely from idx_broadcasters_fid_cn, already in display order
+_SQL_SELECT_BCAST_FOR_IDS = '''
+    SELECT DISTINCT fixture_id, country_norm, channel
+    FROM broadcasters
+    WHERE fixture_id IN (SELECT value FROM json_each(?))
+    ORDER BY fixture_id, country_norm, channel
+'''
+
+_SQL_INSERT_BCAST = '''
+    INSERT OR IGNORE INTO broadcasters (fixture_id, country, channel, country_norm)
+    VALUES (?, ?, ?, ?)
+'''
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds (999)
+_MAX_SQL_VARS = 900
+
+
+# Fixture fields returned by the getters; scraped_at/last_updated are
+# bookkeeping and stay out of the hot queries
+_FIXTURE_KEYS = (
+    'id', 'home_team', 'away_team', 'competition',
+    'fixture_date', 'fixture_time', 'venue'
+)
+
+_FIXTURE_COLS = ', '.join(f'f.{key}' for key in _FIXTURE_KEYS)
+
+
+def _country_sql(template):
+    """Build the exact and substring variants of a country-filtered query"""
+    return {
+        # Equality under NOCASE can seek idx_broadcaster_country
+        False: template.format(cols=_FIXTURE_COLS, match='country = ? COLLATE NOCASE'),
+        # LIKE is already case-insensitive for ASCII but has to scan
+        True: template.format(cols=_FIXTURE_COLS, match='country LIKE ?'),
+    }
+
+
+# Fixture queries return one row per broadcaster (or a single row with NULL
+# country/channel when there are none), ordered so each fixture's rows are
+# adjacent; _iter_grouped folds them back together.
+# Country filters keep every broadcaster of a matching fixture.
+_SQL_SELECT_BY_DATE = '''
+    SELECT {cols}, b.country, b.channel FROM fixtures f
+    LEFT JOIN broadcasters b ON b.fixture_id = f.id
+    WHERE f.fixture_date = ?
+    ORDER BY f.fixture_time, f.id
+'''.format(cols=_FIXTURE_COLS)
+
+_SQL_SELECT_BY_DATE_COUNTRY = _country_sql('''
+    SELECT {cols}, b.country, b.channel FROM fixtures f
+    LEFT JOIN broadcasters b ON b.fixture_id = f.id
+    WHERE f.fixture_date = ? AND f.id IN (
+        SELECT fixture_id FROM broadcasters WHERE {match}
+    )
+    ORDER BY f.fixture_time, f.id
+''')
+
+_SQL_SELECT_BY_COMPETITION = '''
+    SELECT {cols}, b.country, b.channel FROM fixtures f
+    LEFT JOIN broadcasters b ON b.fixture_id = f.id
+    WHERE f.competition = ?
+    ORDER BY f.fixture_date, f.fixture_time, f.id
+'''.format(cols=_FIXTURE_COLS)
+
+_SQL_SELECT_BY_COMPETITION_COUNTRY = _country_sql('''
+    SELECT {cols}, b.country, b.channel FROM fixtures f
+    LEFT JOIN broadcasters b ON b.fixture_id = f.id
+    WHERE f.competition = ? AND f.id IN (
+        SELECT fixture_id FROM broadcasters WHERE {match}
+    )
+    ORDER BY f.fixture_date, f.fixture_time, f.id
+''')
+
+_SQL_SELECT_BY_COUNTRY = _country_sql('''
+    SELECT {cols}, b.country, b.channel FROM fixtures f
+    JOIN broadcasters b ON f.id = b.fixture_id
+    WHERE b.{match}
+    ORDER BY f.fixture_date, f.fixture_time, f.id
+''')
+
+# Number of duplicated keys in each table, in one pass per table
+_SQL_COUNT_DUPLICATES = '''
+    SELECT 'fixtures', COUNT(*) FROM (
+        SELECT 1 FROM fixtures
+        GROUP BY home_team, away_team, competition, fixture_date
+        HAVING COUNT(*) > 1
+    )
+    UNION ALL
+    SELECT 'broadcasters', COUNT(*) FROM (
+        SELECT 1 FROM broadcasters
+        GROUP BY fixture_id, country, channel
+        HAVING COUNT(*) > 1
+    )
+'''
+
+# Whether both tables still have their UNIQUE constraints, which make
+# duplicates impossible
+_SQL_HAS_UNIQUE_KEYS = '''
+    SELECT
+        EXISTS (SELECT 1 FROM pragma_index_list('fixtures') WHERE origin = 'u'),
+        EXISTS (SELECT 1 FROM pragma_index_list('broadcasters') WHERE origin = 'u')
+'''
+
+# Delete all but the most recent row of each duplicated key
+_SQL_DELETE_DUPLICATE_FIXTURES = '''
+    DELETE FROM fixtures
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY home_team, away_team, competition, fixture_date
+                ORDER BY id DESC
+            ) as rn
+            FROM fixtures
+        )
+        WHERE rn > 1
+    )
+'''
+
+_SQL_DELETE_DUPLICATE_BROADCASTERS = '''
+    DELETE FROM broadcasters
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY fixture_id, country, channel
+                ORDER BY id DESC
+            ) as rn
+            FROM broadcasters
+        )
+        WHERE rn > 1
+    )
+'''
+
+_SQL_INSERT_SCRAPE_LOG = '''
+    INSERT INTO scraping_history (scrape_date, fixtures_count, source, status)
+    VALUES (date('now', 'localtime'), ?, ?, ?)
+'''
+
+_SQL_SELECT_SCRAPE_HISTORY = '''
+    SELECT * FROM scraping_history
+    ORDER BY scrape_time DESC
+    LIMIT ?
+'''
+
+_SQL_DATE_RANGE = '''
+    SELECT MIN(fixture_date) as min_date, MAX(fixture_date) as max_date
+    FROM fixtures
+'''
+
+_SQL_COUNT_BY_COMPETITION = '''
+    SELECT competition, COUNT(*) as count 
+    FROM fixtures 
+    GROUP BY competition
+'''
+
+# All scalar stats in one row; the LEFT JOIN keeps the row when there is
+# no scraping history yet
+_SQL_STATS = '''
+    SELECT
+        (SELECT COUNT(*) FROM fixtures) as total_fixtures,
+        (SELECT COUNT(*) FROM broadcasters) as total_broadcasters,
+        (SELECT COUNT(DISTINCT country) FROM broadcasters) as unique_countries,
+        last.scrape_time,
+        last.fixtures_count
+    FROM (SELECT 1)
+    LEFT JOIN (
+        SELECT scrape_time, fixtures_count 
+        FROM scraping_history 
+        ORDER BY scrape_time DESC 
+        LIMIT 1
+    ) last
+'''
+
+
+# Shared FixtureDatabase per database file, see FixtureDatabase.instance()
+_instances = {}
+_instances_lock = threading.Lock()
+
 
 class FixtureDatabase:
-    """Manage fixture data in SQLite database"""
+    """
+    Manage fixture data in SQLite database
+    
+    Prefer FixtureDatabase.instance(path) over constructing directly, so a
+    process reuses one set of connections per database file.
+    """
+    
+    @classmethod
+    def instance(cls, db_path='fixtures.db'):
+        """Return the process-wide FixtureDatabase for db_path"""
+        key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
+        with _instances_lock:
+            db = _instances.get(key)
+            if db is None:
+                db = _instances[key] = cls(db_path)
+            return db
     
     def __init__(self, db_path='fixtures.db'):
         self.db_path = db_path
         self.conn = None
+        self._wal_enabled = False
+        
+        # self.conn is the single writer; reads go through a pool of
+        # read-only connections so they can run alongside it under WAL
+        # Reentrant: with ':memory:' reads also run on the writer, and a
+        # read or write nested inside one must not deadlock its own thread
+        self._write_lock = threading.RLock()
+        self._read_pool = queue.Queue(maxsize=os.cpu_count() or 4)
+        # Bumped by close(); readers from an older generation are closed
+        # when returned instead of going back into the pool
+        self._read_generation = 0
+        self._readers_lock = threading.Lock()
+        # Per-thread connection pinned by snapshot()
+        self._snapshot = threading.local()
+        
         self.create_tables()
     
     def connect(self):
         """Connect to database"""
         if not self.conn:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
+            # isolation_level=None stops the sqlite3 module from scanning
+            # statements and opening implicit transactions; _write() issues
+            # BEGIN IMMEDIATE itself
+            self.conn = sqlite3.connect(self.db_path, cached_statements=256,
+                                        check_same_thread=False,
+                                        isolation_level=None)
+            self._apply_pragmas(self.conn)
         return self.conn
     
+    def _connect_reader(self):
+        """Open a read-only connection to the database file"""
+        uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, cached_statements=256,
+                               check_same_thread=False, isolation_level=None)
+        self._apply_pragmas(conn)
+        return conn
+    
+    @contextmanager
+    def _read(self):
+        """Borrow a pooled read-only connection"""
+        # Inside snapshot(), keep reading from the connection it pinned
+        pinned = getattr(self._snapshot, 'conn', None)
+        if pinned is not None:
+            yield pinned
+            return
+        
+        # An in-memory database only exists on the writer connection
+        if self.db_path == ':memory:':
+            with self._write_lock:
+                yield self.connect()
+            return
+        
+        # Never wait for a reader: a read nested inside another on the same
+        # thread would deadlock. With none idle, open one; it is only kept
+        # if the pool has room when it comes back
+        try:
+            generation, conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            generation, conn = self._read_generation, self._connect_reader()
+        
+        try:
+            yield conn
+        finally:
+            self._release_reader(generation, conn)
+    
+    def _release_reader(self, generation, conn):
+        """Return a reader to the pool, or close it if it can't go back"""
+        with self._readers_lock:
+            if generation == self._read_generation:
+                try:
+                    self._read_pool.put_nowait((generation, conn))
+                    return
+                except queue.Full:
+                    pass
+        conn.close()
+    
+    @contextmanager
+    def snapshot(self):
+        """
+        Run several reads against one consistent view of the database
+        
+        Reads made on this thread inside the block share one connection
+        and one read transaction, so they all see the same data even if a
+        scrape commits in between.
+        """
+        if getattr(self._snapshot, 'conn', None) is not None:
+            yield self
+            return
+        
+        with self._read() as conn:
+            conn.execute('BEGIN')
+            self._snapshot.conn = conn
+            try:
+                yield self
+            finally:
+                self._snapshot.conn = None
+                conn.commit()
+    
+    @contextmanager
+    def _write(self):
+        """Run a block in a write transaction on the writer connection"""
+        with self._write_lock:
+            conn = self.connect()
+            # Nested in a transaction this thread already has open: join it
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    def _apply_pragmas(self, conn):
+        """Tune a new connection for the scrape/query workload"""
+        # journal_mode is stored in the database file, so it only needs
+        # setting once; the rest are per-connection
+        if not self._wal_enabled:
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._wal_enabled = True
+        
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        # Cleanups delete in bulk; don't pay to zero the freed pages
+        conn.execute('PRAGMA secure_delete=OFF')
+        # Required for ON DELETE CASCADE on broadcasters to fire
+        conn.execute('PRAGMA foreign_keys=ON')
+    
     def close(self):
         """Close database connection"""
+        # Readers still borrowed by other threads are closed when returned
+        with self._readers_lock:
+            self._read_generation += 1
+            while True:
+                try:
+                    self._read_pool.get_nowait()[1].close()
+                except queue.Empty:
+                    break
+        
         if self.conn:
+            self._optimize()
             self.conn.close()
             self.conn = None
     
+    def _optimize(self):
+        """Let SQLite refresh planner statistics that have gone stale"""
+        with self._write_lock:
+            self.connect().execute('PRAGMA optimize')
+    
     def create_tables(self):
         """Create database tables if they don't exist"""
+        self._migrate_fixtures_autoincrement()
+        
+        with self._write() as conn:
+            cursor = conn.cursor()
+            self._create_schema(cursor)
+        
+        logger.info(f"Database initialized: {self.db_path}")
+    
+    def _migrate_fixtures_autoincrement(self):
+        """Rebuild a fixtures table created with AUTOINCREMENT without it"""
         conn = self.connect()
-        cursor = conn.cursor()
+        row = conn.execute('''
+            SELECT sql FROM sqlite_master
+            WHERE type = 'table' AND name = 'fixtures'
+        ''').fetchone()
+        if not row or 'AUTOINCREMENT' not in row[0].upper():
+            return
+        
+        # Dropping fixtures with foreign keys on would cascade-delete every
+        # broadcaster, and the pragma can't be changed inside a transaction
+        with self._write_lock:
+            conn.execute('PRAGMA foreign_keys=OFF')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.execute(_SQL_CREATE_FIXTURES.format(table='fixtures_new'))
+                    conn.execute(f'''
+                        INSERT INTO fixtures_new ({_FIXTURE_TABLE_COLS})
+                        SELECT {_FIXTURE_TABLE_COLS} FROM fixtures
+                    ''')
+                    conn.execute('DROP TABLE fixtures')
+                    conn.execute('ALTER TABLE fixtures_new RENAME TO fixtures')
+                    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'fixtures'")
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            finally:
+                conn.execute('PRAGMA foreign_keys=ON')
         
+        logger.info("Migrated fixtures table off AUTOINCREMENT")
+    
+    def _create_schema(self, cursor):
+        """Create tables and indexes inside the caller's transaction"""
         # Fixtures table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS fixtures (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                home_team TEXT NOT NULL,
-                away_team TEXT NOT NULL,
-                competition TEXT NOT NULL,
-                fixture_date DATE NOT NULL,
-                fixture_time TEXT,
-                venue TEXT,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(home_team, away_team, competition, fixture_date)
-            )
-        ''')
+        cursor.execute(_SQL_CREATE_FIXTURES.format(table='fixtures'))
         
         # Broadcasters table
         cursor.execute('''
@@ -64,6 +501,7 @@ class FixtureDatabase:
                 fixture_id INTEGER NOT NULL,
                 country TEXT NOT NULL,
                 channel TEXT NOT NULL,
+                country_norm TEXT,
                 FOREIGN KEY (fixture_id) REFERENCES fixtures (id) ON DELETE CASCADE,
                 UNIQUE(fixture_id, country, channel)
             )
@@ -81,10 +519,21 @@ class FixtureDatabase:
             )
         ''')
         
+        # Key/value bookkeeping, e.g. which channel map country_norm reflects
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
         # Create indexes for faster queries
+        # (date, time) serves date lookups and their ORDER BY fixture_time,
+        # which makes the old single-column date index redundant
+        cursor.execute('DROP INDEX IF EXISTS idx_fixture_date')
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_fixture_date 
-            ON fixtures(fixture_date)
+            CREATE INDEX IF NOT EXISTS idx_fixture_date_time 
+            ON fixtures(fixture_date, fixture_time)
         ''')
         
         cursor.execute('''
@@ -92,13 +541,58 @@ class FixtureDatabase:
             ON fixtures(competition)
         ''')
         
+        # Country lookups compare case-insensitively, so the index has to
+        # use the same collation to be usable (rebuilds the old BINARY one)
+        cursor.execute('''
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_broadcaster_country'
+            AND sql NOT LIKE '%NOCASE%'
+        ''')
+        if cursor.fetchone():
+            cursor.execute('DROP INDEX idx_broadcaster_country')
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_broadcaster_country 
-            ON broadcasters(country)
+            ON broadcasters(country COLLATE NOCASE)
         ''')
         
-        conn.commit()
-        logger.info(f"Database initialized: {self.db_path}")
+        self._refresh_country_norm(cursor)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadcasters_fid_cn 
+            ON broadcasters(fixture_id, country_norm, channel)
+        ''')
+    
+    def _refresh_country_norm(self, cursor):
+        """
+        Keep broadcasters.country_norm in step with CHANNEL_COUNTRY_MAP
+        
+        Adds the column on older databases, and re-maps every stored
+        broadcaster whenever the mapping differs from the one recorded in
+        the metadata table.
+        """
+        cursor.execute('''
+            SELECT 1 FROM pragma_table_info('broadcasters')
+            WHERE name = 'country_norm'
+        ''')
+        if not cursor.fetchone():
+            cursor.execute('ALTER TABLE broadcasters ADD COLUMN country_norm TEXT')
+        
+        cursor.execute("SELECT value FROM metadata WHERE key = 'channel_map'")
+        row = cursor.fetchone()
+        if row and row[0] == CHANNEL_MAP_FINGERPRINT:
+            return
+        
+        cursor.connection.create_function('broadcast_country', 2, broadcast_country,
+                                          deterministic=True)
+        cursor.execute('''
+            UPDATE broadcasters SET country_norm = broadcast_country(country, channel)
+        ''')
+        remapped = cursor.rowcount
+        cursor.execute('''
+            INSERT OR REPLACE INTO metadata (key, value) VALUES ('channel_map', ?)
+        ''', (CHANNEL_MAP_FINGERPRINT,))
+        
+        if remapped:
+            logger.info(f"Re-mapped country_norm for {remapped} broadcasters")
     
     def add_fixture(self, fixture_data):
         """
@@ -111,367 +605,385 @@ class FixtureDatabase:
         Returns:
             fixture_id
         """
-        conn = self.connect()
-        cursor = conn.cursor()
-        
         try:
-            # Check if fixture already exists
-            cursor.execute('''
-                SELECT id FROM fixtures 
-                WHERE home_team = ? AND away_team = ? 
-                AND competition = ? AND fixture_date = ?
-            ''', (
-                fixture_data.get('home_team'),
-                fixture_data.get('away_team'),
-                fixture_data.get('competition'),
-                fixture_data.get('date')
-            ))
-            
-            existing = cursor.fetchone()
-            is_update = existing is not None
-            
-            # Insert or update fixture
-            cursor.execute('''
-                INSERT INTO fixtures (home_team, away_team, competition, 
-                                    fixture_date, fixture_time, venue, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(home_team, away_team, competition, fixture_date)
-                DO UPDATE SET
-                    fixture_time = excluded.fixture_time,
-                    venue = excluded.venue,
-                    last_updated = CURRENT_TIMESTAMP
-            ''', (
-                fixture_data.get('home_team'),
-                fixture_data.get('away_team'),
-                fixture_data.get('competition'),
-                fixture_data.get('date'),
-                fixture_data.get('time'),
-                fixture_data.get('venue')
-            ))
-            
-            # Get fixture_id
-            cursor.execute('''
-                SELECT id FROM fixtures 
-                WHERE home_team = ? AND away_team = ? 
-                AND competition = ? AND fixture_date = ?
-            ''', (
-                fixture_data.get('home_team'),
-                fixture_data.get('away_team'),
-                fixture_data.get('competition'),
-                fixture_data.get('date')
-            ))
-            
-            fixture_id = cursor.fetchone()[0]
-            
-            # Delete existing broadcasters for this fixture to avoid duplicates
-            cursor.execute('DELETE FROM broadcasters WHERE fixture_id = ?', (fixture_id,))
-            
-            # Add broadcasters (fresh set, no duplicates)
-            broadcasters_added = 0
-            for broadcaster in fixture_data.get('broadcasters', []):
-                cursor.execute('''
-                    INSERT OR IGNORE INTO broadcasters (fixture_id, country, channel)
-                    VALUES (?, ?, ?)
-                ''', (
-                    fixture_id,
-                    broadcaster.get('country'),
-                    broadcaster.get('channel')
-                ))
-                if cursor.rowcount > 0:
-                    broadcasters_added += 1
-            
-            conn.commit()
-            return fixture_id
+            with self._write() as conn:
+                cursor = conn.cursor()
+                
+                key = (
+                    fixture_data.get('home_team'),
+                    fixture_data.get('away_team'),
+                    fixture_data.get('competition'),
+                    fixture_data.get('date')
+                )
+                params = key + (fixture_data.get('time'), fixture_data.get('venue'))
+                
+                # Insert or update fixture
+                if _HAS_RETURNING:
+                    cursor.execute(_SQL_UPSERT_FIXTURE_RETURNING, params)
+                else:
+                    # last_insert_rowid() isn't set when the upsert updates,
+                    # so look the id up by key instead
+                    cursor.execute(_SQL_UPSERT_FIXTURE, params)
+                    cursor.execute(_SQL_SELECT_FIXTURE_ID, key)
+                
+                fixture_id = cursor.fetchone()[0]
+                
+                self._sync_broadcasters(cursor, {
+                    fixture_id: self._broadcaster_set(fixture_data)
+                })
+                
+                return fixture_id
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"Error adding fixture: {e}")
             return None
     
-    def add_fixtures_bulk(self, fixtures_list):
-        """Add multiple fixtures at once, tracking new vs updated records"""
-        conn = self.connect()
-        cursor = conn.cursor()
+    def add_fixtures_bulk(self, fixtures_list, source=None):
+        """
+        Add multiple fixtures in one transaction, tracking new vs updated records
         
-        new_fixtures = 0
-        updated_fixtures = 0
+        Args:
+            fixtures_list: List of fixture dicts as accepted by add_fixture
+            source: If given, log the scrape under this source in the same
+                    transaction as the fixtures
+        
+        Returns:
+            Number of fixtures stored
+        """
+        # Key incoming fixtures so repeats collapse onto the last occurrence,
+        # the same outcome as upserting them one at a time
+        fixtures_by_key = {}
         errors = 0
         
         for fixture in fixtures_list:
-            try:
-                # Check if fixture already exists
-                cursor.execute('''
-                    SELECT id FROM fixtures 
-                    WHERE home_team = ? AND away_team = ? 
-                    AND competition = ? AND fixture_date = ?
-                ''', (
-                    fixture.get('home_team'),
-                    fixture.get('away_team'),
-                    fixture.get('competition'),
-                    fixture.get('date')
-                ))
+            key = (
+                fixture.get('home_team'),
+                fixture.get('away_team'),
+                fixture.get('competition'),
+                fixture.get('date')
+            )
+            if None in key:
+                errors += 1
+                logger.debug(f"Skipping fixture with missing fields: {key}")
+                continue
+            fixtures_by_key[key] = fixture
+        
+        if not fixtures_by_key:
+            logger.info(f"Database update: 0 new, 0 updated, {errors} errors (Total: 0 fixtures)")
+            if source:
+                self.log_scrape(0, source=source)
+            return 0
+        
+        try:
+            with self._write() as conn:
+                cursor = conn.cursor()
                 
-                existing = cursor.fetchone()
+                cursor.execute(_SQL_COUNT_FIXTURES)
+                count_before = cursor.fetchone()[0]
                 
-                if self.add_fixture(fixture):
-                    if existing:
-                        updated_fixtures += 1
-                    else:
-                        new_fixtures += 1
-                        
-            except Exception as e:
-                errors += 1
-                logger.debug(f"Error processing fixture: {e}")
+                cursor.executemany(_SQL_UPSERT_FIXTURE, [
+                    key + (fixture.get('time'), fixture.get('venue'))
+                    for key, fixture in fixtures_by_key.items()
+                ])
+                
+                cursor.execute(_SQL_COUNT_FIXTURES)
+                new_fixtures = cursor.fetchone()[0] - count_before
+                updated_fixtures = len(fixtures_by_key) - new_fixtures
+                
+                # Resolve every fixture id by querying the touched dates
+                dates = list({key[3] for key in fixtures_by_key})
+                fixture_ids = {}
+                for start in range(0, len(dates), _MAX_SQL_VARS):
+                    chunk = dates[start:start + _MAX_SQL_VARS]
+                    cursor.execute(
+                        _SQL_SELECT_FIXTURE_IDS_FOR_DATES.format(
+                            placeholders=','.join('?' * len(chunk))),
+                        chunk
+                    )
+                    fixture_ids.update((tuple(row[1:]), row[0]) for row in cursor)
+                
+                ids = []
+                for key in fixtures_by_key:
+                    fixture_id = fixture_ids.get(key)
+                    if fixture_id is None:
+                        # Stored in a different form than it was passed (a
+                        # date object, or digits the DATE column turned into
+                        # a number); let SQLite do the comparison instead
+                        cursor.execute(_SQL_SELECT_FIXTURE_ID, key)
+                        fixture_id = cursor.fetchone()[0]
+                    ids.append(fixture_id)
+                
+                self._sync_broadcasters(cursor, {
+                    fixture_id: self._broadcaster_set(fixture)
+                    for fixture_id, fixture in zip(ids, fixtures_by_key.values())
+                })
+                
+                total = new_fixtures + updated_fixtures
+                if source:
+                    self.log_scrape(total, source=source, commit=False)
+            
+        except Exception as e:
+            logger.error(f"Error adding fixtures: {e}")
+            if source:
+                self.log_scrape(0, source=source, status='error')
+            return 0
         
-        total = new_fixtures + updated_fixtures
         logger.info(f"Database update: {new_fixtures} new, {updated_fixtures} updated, {errors} errors (Total: {total} fixtures)")
         return total
     
-    def get_fixtures_by_date(self, target_date=None, country=None):
+    @staticmethod
+    def _broadcaster_set(fixture_data):
+        """(country, channel) pairs a scraped fixture should end up with"""
+        # Incomplete entries can't satisfy the NOT NULL columns; skip them
+        # rather than failing the whole write
+        pairs = set()
+        for broadcaster in fixture_data.get('broadcasters', []):
+            country = broadcaster.get('country')
+            channel = broadcaster.get('channel')
+            if country is not None and channel is not None:
+                pairs.add((country, channel))
+        return pairs
+    
+    def _sync_broadcasters(self, cursor, wanted):
+        """
+        Bring stored broadcasters in line with the scraped ones
+        
+        Only rows that were added or dropped since the last scrape are
+        written, so an unchanged re-scrape touches nothing.
+        
+        Args:
+            cursor: Cursor inside the caller's write transaction
+            wanted: Dict of fixture_id -> set of (country, channel)
+        """
+        current = {fixture_id: set() for fixture_id in wanted}
+        ids = list(wanted)
+        for start in range(0, len(ids), _MAX_SQL_VARS):
+            chunk = ids[start:start + _MAX_SQL_VARS]
+            cursor.execute(
+                _SQL_SELECT_BCAST_FOR.format(placeholders=','.join('?' * len(chunk))),
+                chunk
+            )
+            for fixture_id, country, channel in cursor:
+                current[fixture_id].add((country, channel))
+        
+        removed = []
+        added = []
+        for fixture_id, pairs in wanted.items():
+            existing = current[fixture_id]
+            removed.extend((fixture_id,) + pair for pair in existing - pairs)
+            added.extend(
+                (fixture_id, country, channel, broadcast_country(country, channel))
+                for country, channel in pairs - existing
+            )
+        
+        if removed:
+            cursor.executemany(_SQL_DELETE_BCAST, removed)
+        if added:
+            cursor.executemany(_SQL_INSERT_BCAST, added)
+    
+    def get_fixtures_by_date(self, target_date=None, country=None, substring=False):
         """
         Get fixtures for a specific date
         
         Args:
             target_date: Date string (YYYY-MM-DD) or None for today
             country: Filter by country or None for all
+            substring: Match country anywhere in the name instead of exactly
         
         Returns:
             List of fixtures with broadcasters
         """
         if target_date is None:
-            target_date = str(date.today())
+            target_date = date.today().isoformat()
         
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        if country:
-            query = '''
-                SELECT DISTINCT f.* FROM fixtures f
-                JOIN broadcasters b ON f.id = b.fixture_id
-                WHERE f.fixture_date = ? AND UPPER(b.country) LIKE ?
-                ORDER BY f.fixture_time
-            '''
-            cursor.execute(query, (target_date, f'%{country.upper()}%'))
-        else:
-            cursor.execute('''
-                SELECT * FROM fixtures
-                WHERE fixture_date = ?
-                ORDER BY fixture_time
-            ''', (target_date,))
-        
-        fixtures = []
-        for row in cursor.fetchall():
-            fixture = dict(row)
+        with self._read() as conn:
+            cursor = conn.cursor()
             
-            # Get broadcasters for this fixture
-            cursor.execute('''
-                SELECT country, channel FROM broadcasters
-                WHERE fixture_id = ?
-            ''', (fixture['id'],))
-            
-            broadcasters = [
-                {'country': b['country'], 'channel': b['channel']}
-                for b in cursor.fetchall()
-            ]
+            if country:
+                cursor.execute(_SQL_SELECT_BY_DATE_COUNTRY[substring],
+                               (target_date, self._country_param(country, substring)))
+            else:
+                cursor.execute(_SQL_SELECT_BY_DATE, (target_date,))
             
-            fixture['broadcasters'] = broadcasters
-            fixtures.append(fixture)
-        
-        return fixtures
+            return list(self._iter_grouped(cursor))
     
-    def get_fixtures_by_competition(self, competition, country=None):
+    def get_fixtures_by_competition(self, competition, country=None, substring=False):
         """Get all fixtures for a specific competition"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        if country:
-            query = '''
-                SELECT DISTINCT f.* FROM fixtures f
-                JOIN broadcasters b ON f.id = b.fixture_id
-                WHERE f.competition = ? AND UPPER(b.country) LIKE ?
-                ORDER BY f.fixture_date, f.fixture_time
-            '''
-            cursor.execute(query, (competition, f'%{country.upper()}%'))
-        else:
-            cursor.execute('''
-                SELECT * FROM fixtures
-                WHERE competition = ?
-                ORDER BY fixture_date, fixture_time
-            ''', (competition,))
-        
-        fixtures = []
-        for row in cursor.fetchall():
-            fixture = dict(row)
+        with self._read() as conn:
+            cursor = conn.cursor()
             
-            # Get broadcasters
-            cursor.execute('''
-                SELECT country, channel FROM broadcasters
-                WHERE fixture_id = ?
-            ''', (fixture['id'],))
+            if country:
+                cursor.execute(_SQL_SELECT_BY_COMPETITION_COUNTRY[substring],
+                               (competition, self._country_param(country, substring)))
+            else:
+                cursor.execute(_SQL_SELECT_BY_COMPETITION, (competition,))
             
-            broadcasters = [
-                {'country': b['country'], 'channel': b['channel']}
-                for b in cursor.fetchall()
-            ]
-            
-            fixture['broadcasters'] = broadcasters
-            fixtures.append(fixture)
-        
-        return fixtures
+            return list(self._iter_grouped(cursor))
     
-    def get_fixtures_by_country(self, country):
+    def get_fixtures_by_country(self, country, substring=False):
         """Get all fixtures available in a specific country"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT f.*, b.country, b.channel FROM fixtures f
-            JOIN broadcasters b ON f.id = b.fixture_id
-            WHERE UPPER(b.country) LIKE ?
-            ORDER BY f.fixture_date, f.fixture_time
-        ''', (f'%{country.upper()}%',))
-        
-        results = cursor.fetchall()
-        
-        # Group by fixture
-        fixtures_dict = {}
-        for row in results:
-            fixture_id = row['id']
-            
-            if fixture_id not in fixtures_dict:
-                fixtures_dict[fixture_id] = {
-                    'id': row['id'],
-                    'home_team': row['home_team'],
-                    'away_team': row['away_team'],
-                    'competition': row['competition'],
-                    'fixture_date': row['fixture_date'],
-                    'fixture_time': row['fixture_time'],
-                    'venue': row['venue'],
-                    'broadcasters': []
-                }
+        return list(self.iter_fixtures_by_country(country, substring))
+    
+    def iter_fixtures_by_country(self, country, substring=False):
+        """Yield fixtures available in a specific country one at a time"""
+        with self._read() as conn:
+            cursor = conn.execute(_SQL_SELECT_BY_COUNTRY[substring],
+                                  (self._country_param(country, substring),))
             
-            fixtures_dict[fixture_id]['broadcasters'].append({
-                'country': row['country'],
-                'channel': row['channel']
-            })
+            yield from self._iter_grouped(cursor)
+    
+    def get_broadcasters(self, fixture_ids):
+        """
+        Get broadcasters for several fixtures at once
+        
+        Returns:
+            Dict of fixture_id -> list of distinct (country, channel),
+            sorted by country then channel. The country is the one the
+            channel maps to (see channel_map.broadcast_country), falling
+            back to the scraped country.
+        """
+        by_fixture = {fixture_id: [] for fixture_id in fixture_ids}
+        
+        with self._read() as conn:
+            cursor = conn.execute(_SQL_SELECT_BCAST_FOR_IDS,
+                                  (json.dumps(list(by_fixture)),))
+            # The same few countries and channels repeat across a listing;
+            # intern them so each is stored once rather than once per row
+            intern = sys.intern
+            for fixture_id, country, channel in cursor:
+                by_fixture[fixture_id].append((intern(country), intern(channel)))
         
-        return list(fixtures_dict.values())
+        return by_fixture
     
-    def log_scrape(self, fixtures_count, source='LiveSoccerTV', status='success'):
-        """Log scraping activity"""
-        conn = self.connect()
-        cursor = conn.cursor()
+    @staticmethod
+    def _country_param(country, substring):
+        """Bind value for a country filter built by _country_sql"""
+        return f'%{country}%' if substring else country
+    
+    @staticmethod
+    def _iter_grouped(cursor):
+        """Group joined rows, ordered by fixture, into fixtures with broadcaster lists"""
+        # Rows are plain tuples: _FIXTURE_KEYS columns, then country, channel
+        n_keys = len(_FIXTURE_KEYS)
         
-        cursor.execute('''
-            INSERT INTO scraping_history (scrape_date, fixtures_count, source, status)
-            VALUES (?, ?, ?, ?)
-        ''', (str(date.today()), fixtures_count, source, status))
+        for _, rows in groupby(cursor, key=itemgetter(0)):
+            first = next(rows)
+            fixture = dict(zip(_FIXTURE_KEYS, first))
+            fixture['broadcasters'] = [
+                {'country': row[n_keys], 'channel': row[n_keys + 1]}
+                for row in (first, *rows)
+                if row[n_keys + 1] is not None
+            ]
+            yield fixture
+    
+    def log_scrape(self, fixtures_count, source='LiveSoccerTV', status='success', commit=True):
+        """
+        Log scraping activity
         
-        conn.commit()
+        With commit=False the row is added to the write transaction the
+        caller already has open, and is committed along with it.
+        """
+        params = (fixtures_count, source, status)
+        
+        if not commit:
+            self.conn.execute(_SQL_INSERT_SCRAPE_LOG, params)
+            return
+        
+        with self._write() as conn:
+            conn.execute(_SQL_INSERT_SCRAPE_LOG, params)
     
     def get_scraping_history(self, limit=10):
         """Get recent scraping history"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM scraping_history
-            ORDER BY scrape_time DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        return [dict(row) for row in cursor.fetchall()]
+        with self._read() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_SELECT_SCRAPE_HISTORY, (limit,))
+            
+            keys = tuple(col[0] for col in cursor.description)
+            return [dict(zip(keys, row)) for row in cursor.fetchall()]
     
-    def export_to_json(self, output_file, country=None, target_date=None):
+    def export_to_json(self, output_file, country=None, target_date=None, substring=False):
         """Export fixtures to JSON file"""
         if target_date:
-            fixtures = self.get_fixtures_by_date(target_date, country)
+            fixtures = self.get_fixtures_by_date(target_date, country, substring)
+        elif country:
+            fixtures = self.iter_fixtures_by_country(country, substring)
         else:
-            fixtures = self.get_fixtures_by_country(country) if country else []
+            fixtures = []
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(fixtures, f, indent=2, ensure_ascii=False)
+        # Write one fixture per line as they come off the cursor rather than
+        # building the whole list for json.dump
+        count = 0
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write('[')
+            for fixture in fixtures:
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(fixture, ensure_ascii=False))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
         
-        logger.info(f"Exported {len(fixtures)} fixtures to {output_file}")
-        return len(fixtures)
+        logger.info(f"Exported {count} fixtures to {output_file}")
+        return count
     
     def get_stats(self):
         """Get database statistics"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        # Total fixtures
-        cursor.execute('SELECT COUNT(*) as count FROM fixtures')
-        total_fixtures = cursor.fetchone()['count']
-        
-        # Fixtures by competition
-        cursor.execute('''
-            SELECT competition, COUNT(*) as count 
-            FROM fixtures 
-            GROUP BY competition
-        ''')
-        by_competition = dict(cursor.fetchall())
-        
-        # Total broadcasters
-        cursor.execute('SELECT COUNT(*) as count FROM broadcasters')
-        total_broadcasters = cursor.fetchone()['count']
-        
-        # Unique countries
-        cursor.execute('SELECT COUNT(DISTINCT country) as count FROM broadcasters')
-        unique_countries = cursor.fetchone()['count']
+        with self._read() as conn:
+            cursor = conn.cursor()
+            
+            # Totals and last scrape
+            cursor.execute(_SQL_STATS)
+            (total_fixtures, total_broadcasters, unique_countries,
+             scrape_time, fixtures_count) = cursor.fetchone()
+            
+            # Fixtures by competition
+            cursor.execute(_SQL_COUNT_BY_COMPETITION)
+            by_competition = dict(cursor.fetchall())
         
-        # Last scrape
-        cursor.execute('''
-            SELECT scrape_time, fixtures_count 
-            FROM scraping_history 
-            ORDER BY scrape_time DESC 
-            LIMIT 1
-        ''')
-        last_scrape = cursor.fetchone()
+        last_scrape = None
+        if scrape_time is not None:
+            last_scrape = {
+                'scrape_time': scrape_time,
+                'fixtures_count': fixtures_count
+            }
         
         return {
             'total_fixtures': total_fixtures,
             'by_competition': by_competition,
             'total_broadcasters': total_broadcasters,
             'unique_countries': unique_countries,
-            'last_scrape': dict(last_scrape) if last_scrape else None
+            'last_scrape': last_scrape
         }
     
+    def get_date_range(self):
+        """Get the earliest and latest fixture dates, or (None, None) if empty"""
+        with self._read() as conn:
+            return conn.execute(_SQL_DATE_RANGE).fetchone()
+    
     def clear_old_fixtures(self, days_old=30):
         """Delete fixtures older than specified days"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM fixtures
-            WHERE fixture_date < date('now', '-' || ? || ' days')
-        ''', (days_old,))
+        with self._write() as conn:
+            cursor = conn.execute('''
+                DELETE FROM fixtures
+                WHERE fixture_date < date('now', '-' || ? || ' days')
+            ''', (days_old,))
+            
+            deleted = cursor.rowcount
         
-        deleted = cursor.rowcount
-        conn.commit()
+        if deleted > 0:
+            self._optimize()
         
         logger.info(f"Deleted {deleted} fixtures older than {days_old} days")
         return deleted
     
     def remove_duplicate_fixtures(self):
         """Remove any duplicate fixtures (shouldn't happen with UNIQUE constraint)"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        # Find duplicates (keep the most recent one)
-        cursor.execute('''
-            DELETE FROM fixtures
-            WHERE id NOT IN (
-                SELECT MAX(id)
-                FROM fixtures
-                GROUP BY home_team, away_team, competition, fixture_date
-            )
-        ''')
-        
-        deleted = cursor.rowcount
-        conn.commit()
+        with self._write() as conn:
+            cursor = conn.execute(_SQL_DELETE_DUPLICATE_FIXTURES)
+            
+            deleted = cursor.rowcount
         
         if deleted > 0:
+            self._optimize()
             logger.info(f"Removed {deleted} duplicate fixtures")
         else:
             logger.info("No duplicate fixtures found")
@@ -480,59 +992,66 @@ class FixtureDatabase:
     
     def remove_duplicate_broadcasters(self):
         """Remove any duplicate broadcaster entries"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        # Find duplicates (keep the most recent one)
-        cursor.execute('''
-            DELETE FROM broadcasters
-            WHERE id NOT IN (
-                SELECT MAX(id)
-                FROM broadcasters
-                GROUP BY fixture_id, country, channel
-            )
-        ''')
-        
-        deleted = cursor.rowcount
-        conn.commit()
+        with self._write() as conn:
+            cursor = conn.execute(_SQL_DELETE_DUPLICATE_BROADCASTERS)
+            
+            deleted = cursor.rowcount
         
         if deleted > 0:
+            self._optimize()
             logger.info(f"Removed {deleted} duplicate broadcaster entries")
         else:
             logger.info("No duplicate broadcasters found")
         
         return deleted
     
-    def check_for_duplicates(self):
-        """Check if there are any duplicates in the database"""
-        conn = self.connect()
-        cursor = conn.cursor()
+    def remove_duplicates(self):
+        """
+        Remove duplicate fixtures and broadcasters in one transaction
         
-        # Check fixture duplicates
-        cursor.execute('''
-            SELECT home_team, away_team, competition, fixture_date, COUNT(*) as count
-            FROM fixtures
-            GROUP BY home_team, away_team, competition, fixture_date
-            HAVING count > 1
-        ''')
+        Returns:
+            Tuple of (fixtures removed, broadcasters removed)
+        """
+        with self._write() as conn:
+            fixtures_removed = conn.execute(_SQL_DELETE_DUPLICATE_FIXTURES).rowcount
+            broadcasters_removed = conn.execute(_SQL_DELETE_DUPLICATE_BROADCASTERS).rowcount
         
-        fixture_dupes = cursor.fetchall()
+        if fixtures_removed or broadcasters_removed:
+            self._optimize()
         
-        # Check broadcaster duplicates
-        cursor.execute('''
-            SELECT fixture_id, country, channel, COUNT(*) as count
-            FROM broadcasters
-            GROUP BY fixture_id, country, channel
-            HAVING count > 1
-        ''')
+        logger.info(f"Removed {fixtures_removed} duplicate fixtures and "
+                    f"{broadcasters_removed} duplicate broadcaster entries")
+        return fixtures_removed, broadcasters_removed
+    
+    def check_for_duplicates(self, full_scan=False):
+        """
+        Check if there are any duplicates in the database
+        
+        Both tables carry UNIQUE constraints, so by default the scan is
+        skipped when those are in place; pass full_scan=True to count
+        duplicate groups regardless.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            
+            if not full_scan:
+                cursor.execute(_SQL_HAS_UNIQUE_KEYS)
+                full_scan = not all(cursor.fetchone())
+            
+            if full_scan:
+                cursor.execute(_SQL_COUNT_DUPLICATES)
+                counts = dict(cursor.fetchall())
+            else:
+                counts = {'fixtures': 0, 'broadcasters': 0}
         
-        broadcaster_dupes = cursor.fetchall()
+        fixture_dupes = counts['fixtures']
+        broadcaster_dupes = counts['broadcasters']
         
         if fixture_dupes or broadcaster_dupes:
-            logger.warning(f"Found {len(fixture_dupes)} duplicate fixtures and {len(broadcaster_dupes)} duplicate broadcasters")
+            logger.warning(f"Found {fixture_dupes} duplicate fixtures and {broadcaster_dupes} duplicate broadcasters")
             return {
-                'fixture_duplicates': len(fixture_dupes),
-                'broadcaster_duplicates': len(broadcaster_dupes),
+                'fixture_duplicates': fixture_dupes,
+                'broadcaster_duplicates': broadcaster_dupes,
                 'has_duplicates': True
             }
         else:
@@ -3,8 +3,11 @@ Football Fixtures Scraper - Main Interface
 Query and scrape football fixtures with broadcast information
 """
 
+import atexit
 import sys
-from datetime import date
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
 from database_manager import FixtureDatabase
 from cloudflare_bypass_scraper import CloudflareBypassScraper
 import logging
@@ -15,120 +18,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Channel to country mapping
-CHANNEL_COUNTRY_MAP = {
-    # USA/America
-    'NBC': 'USA', 'NBC Sports': 'USA', 'Peacock': 'USA', 'Peacock Premium': 'USA',
-    'USA Network': 'USA', 'Universo': 'USA', 'ESPN': 'USA', 'ESPN+': 'USA',
-    'ESPN Deportes': 'USA', 'CBS Sports': 'USA', 'CBS Sports Network': 'USA',
-    'CBS Sports Golazo Network': 'USA', 'Paramount+': 'USA', 'beIN Sports': 'USA',
-    'beIN Sports USA': 'USA', 'beIN Sports en Español': 'USA',
-    
-    # UK
-    'Sky Sports': 'UK', 'Sky Sports Premier League': 'UK', 'Sky Sports Main Event': 'UK',
-    'Sky Sports Ultra HDR': 'UK', 'Sky Sports 4K': 'UK', 'TNT Sports': 'UK',
-    'TNT Sports 1': 'UK', 'TNT Sports 2': 'UK', 'TNT Sports 3': 'UK', 'TNT Sports 4': 'UK',
-    'LaLigaTV': 'UK', 'Premier Sports': 'UK', 'Premier Sports 1': 'UK', 'Premier Sports 2': 'UK',
-    
-    # Spain
-    'DAZN España': 'Spain', 'DAZN Spain': 'Spain', 'DAZN LaLiga': 'Spain', 'DAZN1 Spain': 'Spain',
-    'Movistar': 'Spain', 'Movistar+': 'Spain', 'Movistar LaLiga': 'Spain',
-    'Movistar+ Deportes': 'Spain', 'Movistar+ Deportes 2': 'Spain',
-    'LaLiga TV Bar': 'Spain',
-    
-    # Germany
-    'Sky Sport': 'Germany', 'Sky Sport Premier League': 'Germany',
-    'DAZN Germany': 'Germany', 'WOW': 'Germany',
-    
-    # Austria
-    'Sky Sport Austria': 'Austria', 'DAZN Austria': 'Austria',
-    
-    # Italy
-    'DAZN Italia': 'Italy',
-    
-    # Portugal
-    'DAZN Portugal': 'Portugal', 'DAZN1 Portugal': 'Portugal',
-    
-    # Albania
-    'SuperSport 2 Digitalb': 'Albania', 'SuperSport 3 Digitalb': 'Albania',
-    'Tring': 'Albania', 'Tring Sport 1': 'Albania',
-    
-    # France
-    'Canal+ France': 'France', 'Canal+ Sport': 'France',
-    
-    # International
-    'Bet365': 'International',
-    'DAZN': 'International',
-}
+DB_PATH = 'output/fixtures.db'
 
-def get_country_for_channel(channel_name):
-    """Map channel name to country"""
-    if channel_name in CHANNEL_COUNTRY_MAP:
-        return CHANNEL_COUNTRY_MAP[channel_name]
-    
-    for key, country in CHANNEL_COUNTRY_MAP.items():
-        if key.lower() in channel_name.lower():
-            return country
-    
-    return 'Various'
+# Rule printed above and below each report
+_BAR = "=" * 80
+
+# English names for report titles, so they don't depend on the locale
+_WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December']
+
+_db = None
+
+
+def get_db():
+    """Shared database for the CLI commands, opened on first use"""
+    global _db
+    if _db is None:
+        _db = FixtureDatabase.instance(DB_PATH)
+    return _db
+
+
+@atexit.register
+def _close_db():
+    """Close the shared database at interpreter exit"""
+    if _db is not None:
+        _db.close()
+
+
+def _format_long_date(day):
+    """Format a date like 'Monday, January 12, 2026'"""
+    return f"{_WEEKDAYS[day.weekday()]}, {_MONTHS[day.month - 1]} {day.day:02d}, {day.year}"
 
 
 def print_fixtures(fixtures, db, title="FIXTURES"):
     """Print fixtures with broadcast information"""
-    print("\n" + "="*80)
-    print(title)
-    print("="*80)
+    out = [f"\n{_BAR}\n", f"{title}\n", f"{_BAR}\n"]
     
     if not fixtures:
-        print("\nNo fixtures found")
+        out.append("\nNo fixtures found\n")
+        sys.stdout.write(''.join(out))
         return
     
+    broadcasters_by_fixture = db.get_broadcasters(fixture['id'] for fixture in fixtures)
+    
     for fixture in fixtures:
-        print(f"\n{fixture['fixture_time']} - {fixture['home_team']} vs {fixture['away_team']}")
-        print(f"  Competition: {fixture['competition']}")
-        print(f"  Date: {fixture['fixture_date']}")
+        out.append(f"\n{fixture['fixture_time']} - {fixture['home_team']} vs {fixture['away_team']}\n")
+        out.append(f"  Competition: {fixture['competition']}\n")
+        out.append(f"  Date: {fixture['fixture_date']}\n")
         if fixture.get('venue'):
-            print(f"  Venue: {fixture['venue']}")
-        
-        # Get broadcasters
-        cursor = db.conn.execute("""
-            SELECT DISTINCT country, channel
-            FROM broadcasters
-            WHERE fixture_id = ?
-            ORDER BY country, channel
-        """, (fixture['id'],))
+            out.append(f"  Venue: {fixture['venue']}\n")
         
-        broadcasters = cursor.fetchall()
+        broadcasters = broadcasters_by_fixture[fixture['id']]
         
         if broadcasters:
-            print(f"  Broadcasting in:")
-            
-            # Group by country
-            by_country = {}
-            for country, channel in broadcasters:
-                actual_country = get_country_for_channel(channel)
-                if actual_country != 'Various':
-                    country = actual_country
-                
-                if country not in by_country:
-                    by_country[country] = []
-                by_country[country].append(channel)
+            out.append("  Broadcasting in:\n")
             
-            for country in sorted(by_country.keys()):
-                channels = ', '.join(sorted(set(by_country[country])))
-                print(f"    {country}: {channels}")
+            # Already mapped to the channel's country and sorted by the database
+            for country, rows in groupby(broadcasters, key=itemgetter(0)):
+                channels = ', '.join(channel for _, channel in rows)
+                out.append(f"    {country}: {channels}\n")
     
-    print("\n" + "="*80)
+    out.append(f"\n{_BAR}\n")
+    sys.stdout.write(''.join(out))
 
 
 def scrape_fixtures():
     """Scrape fixtures from LiveSoccerTV"""
-    db = FixtureDatabase('output/fixtures.db')
+    db = get_db()
     scraper = CloudflareBypassScraper()
     
-    logger.info("="*80)
+    logger.info(_BAR)
     logger.info("SCRAPING FIXTURES FROM LIVESOCCERTV")
-    logger.info("="*80)
+    logger.info(_BAR)
     
     try:
         success = scraper.scrape_all_leagues()
@@ -136,15 +98,14 @@ def scrape_fixtures():
         if success and scraper.fixtures:
             logger.info(f"\n✓ Scraped {len(scraper.fixtures)} fixtures")
             
-            added = db.add_fixtures_bulk(scraper.fixtures)
-            db.log_scrape(added, source='LiveSoccerTV', status='success')
+            added = db.add_fixtures_bulk(scraper.fixtures, source='LiveSoccerTV')
             
             logger.info(f"✓ Stored {added} fixtures in database")
             
             stats = db.get_stats()
-            logger.info("\n" + "="*80)
+            logger.info("\n" + _BAR)
             logger.info("DATABASE STATISTICS")
-            logger.info("="*80)
+            logger.info(_BAR)
             logger.info(f"Total fixtures: {stats['total_fixtures']}")
             logger.info(f"Total broadcast entries: {stats['total_broadcasters']}")
             logger.info(f"Countries covered: {stats['unique_countries']}")
@@ -154,7 +115,7 @@ def scrape_fixtures():
                 for comp, count in stats['by_competition'].items():
                     logger.info(f"  {comp}: {count}")
             
-            logger.info("="*80)
+            logger.info(_BAR)
             
         else:
             logger.warning("No fixtures found")
@@ -165,146 +126,121 @@ def scrape_fixtures():
         db.log_scrape(0, source='LiveSoccerTV', status='interrupted')
     finally:
         scraper.close()
-        db.close()
 
 
 def query_today():
     """Show today's fixtures"""
-    db = FixtureDatabase('output/fixtures.db')
-    today_str = str(date.today())
-    fixtures = db.get_fixtures_by_date(today_str)
+    db = get_db()
+    today = date.today()
+    fixtures = db.get_fixtures_by_date(today.isoformat())
     
-    title = f"TODAY'S FIXTURES - {date.today().strftime('%A, %B %d, %Y')}"
+    title = f"TODAY'S FIXTURES - {_format_long_date(today)}"
     print_fixtures(fixtures, db, title)
-    db.close()
 
 
 def query_tomorrow():
     """Show tomorrow's fixtures"""
-    db = FixtureDatabase('output/fixtures.db')
-    from datetime import timedelta
+    db = get_db()
     tomorrow = date.today() + timedelta(days=1)
-    fixtures = db.get_fixtures_by_date(str(tomorrow))
+    fixtures = db.get_fixtures_by_date(tomorrow.isoformat())
     
-    title = f"TOMORROW'S FIXTURES - {tomorrow.strftime('%A, %B %d, %Y')}"
+    title = f"TOMORROW'S FIXTURES - {_format_long_date(tomorrow)}"
     print_fixtures(fixtures, db, title)
-    db.close()
 
 
 def query_country(country):
     """Show fixtures for a specific country"""
-    db = FixtureDatabase('output/fixtures.db')
-    fixtures = db.get_fixtures_by_country(country)
+    db = get_db()
+    fixtures = db.get_fixtures_by_country(country, substring=True)
     
     title = f"FIXTURES BROADCASTING IN {country.upper()}"
     print_fixtures(fixtures, db, title)
-    db.close()
 
 
 def query_competition(competition):
     """Show fixtures for a specific competition"""
-    db = FixtureDatabase('output/fixtures.db')
+    db = get_db()
     fixtures = db.get_fixtures_by_competition(competition)
     
     title = f"{competition.upper()} FIXTURES"
     print_fixtures(fixtures, db, title)
-    db.close()
 
 
 def show_stats():
     """Show database statistics"""
-    db = FixtureDatabase('output/fixtures.db')
-    stats = db.get_stats()
+    db = get_db()
     
-    print("\n" + "="*80)
-    print("DATABASE STATISTICS")
-    print("="*80)
-    print(f"\nTotal fixtures: {stats['total_fixtures']}")
-    print(f"Total broadcast entries: {stats['total_broadcasters']}")
-    print(f"Countries covered: {stats['unique_countries']}")
+    # One read transaction, so the numbers all come from the same state
+    with db.snapshot():
+        stats = db.get_stats()
+        dates = db.get_date_range()
+        dupe_check = db.check_for_duplicates()
+    
+    out = [f"\n{_BAR}\n", "DATABASE STATISTICS\n", f"{_BAR}\n"]
+    out.append(f"\nTotal fixtures: {stats['total_fixtures']}\n")
+    out.append(f"Total broadcast entries: {stats['total_broadcasters']}\n")
+    out.append(f"Countries covered: {stats['unique_countries']}\n")
     
     if stats['by_competition']:
-        print("\nFixtures by competition:")
+        out.append("\nFixtures by competition:\n")
         for comp, count in stats['by_competition'].items():
-            print(f"  {comp}: {count}")
+            out.append(f"  {comp}: {count}\n")
     
     # Show date range
-    cursor = db.conn.execute("""
-        SELECT MIN(fixture_date) as min_date, MAX(fixture_date) as max_date
-        FROM fixtures
-    """)
-    dates = cursor.fetchone()
-    if dates and dates[0]:
-        print(f"\nDate range: {dates[0]} to {dates[1]}")
+    if dates[0]:
+        out.append(f"\nDate range: {dates[0]} to {dates[1]}\n")
     
     # Check for duplicates
-    dupe_check = db.check_for_duplicates()
     if dupe_check['has_duplicates']:
-        print(f"\n⚠️  WARNING: {dupe_check['fixture_duplicates']} duplicate fixtures, "
-              f"{dupe_check['broadcaster_duplicates']} duplicate broadcasters")
-        print("   Run 'python fixtures.py clean' to remove duplicates")
+        out.append(f"\n⚠️  WARNING: {dupe_check['fixture_duplicates']} duplicate fixtures, "
+                   f"{dupe_check['broadcaster_duplicates']} duplicate broadcasters\n")
+        out.append("   Run 'python fixtures.py clean' to remove duplicates\n")
     
-    print("="*80 + "\n")
-    db.close()
+    out.append(f"{_BAR}\n\n")
+    sys.stdout.write(''.join(out))
 
 
 def check_duplicates():
     """Check for duplicate entries in database"""
-    db = FixtureDatabase('output/fixtures.db')
+    db = get_db()
     
-    print("\n" + "="*80)
-    print("CHECKING FOR DUPLICATES")
-    print("="*80 + "\n")
+    out = [f"\n{_BAR}\n", "CHECKING FOR DUPLICATES\n", f"{_BAR}\n\n"]
     
-    result = db.check_for_duplicates()
+    result = db.check_for_duplicates(full_scan=True)
     
     if result['has_duplicates']:
-        print(f"⚠️  Found issues:")
-        print(f"   Duplicate fixtures: {result['fixture_duplicates']}")
-        print(f"   Duplicate broadcasters: {result['broadcaster_duplicates']}")
-        print("\n💡 Run 'python fixtures.py clean' to remove duplicates")
+        out.append("⚠️  Found issues:\n")
+        out.append(f"   Duplicate fixtures: {result['fixture_duplicates']}\n")
+        out.append(f"   Duplicate broadcasters: {result['broadcaster_duplicates']}\n")
+        out.append("\n💡 Run 'python fixtures.py clean' to remove duplicates\n")
     else:
-        print("✓ No duplicates found - database is clean!")
+        out.append("✓ No duplicates found - database is clean!\n")
     
-    print("="*80 + "\n")
-    db.close()
+    out.append(f"{_BAR}\n\n")
+    sys.stdout.write(''.join(out))
 
 
 def clean_database():
     """Remove duplicate entries from database"""
-    db = FixtureDatabase('output/fixtures.db')
+    db = get_db()
     
-    print("\n" + "="*80)
+    print("\n" + _BAR)
     print("CLEANING DATABASE")
-    print("="*80 + "\n")
+    print(f"{_BAR}\n")
     
-    # Check first
-    result = db.check_for_duplicates()
+    # The deletes find the duplicates themselves, so no separate check first
+    fixtures_removed, broadcasters_removed = db.remove_duplicates()
     
-    if not result['has_duplicates']:
+    if not fixtures_removed and not broadcasters_removed:
         print("✓ Database is already clean - no duplicates found")
-        print("="*80 + "\n")
-        db.close()
+        print(f"{_BAR}\n")
         return
     
-    print(f"Found {result['fixture_duplicates']} duplicate fixtures and "
-          f"{result['broadcaster_duplicates']} duplicate broadcasters\n")
-    
-    # Clean fixtures
-    if result['fixture_duplicates'] > 0:
-        print("Removing duplicate fixtures...")
-        removed = db.remove_duplicate_fixtures()
-        print(f"✓ Removed {removed} duplicate fixtures")
-    
-    # Clean broadcasters
-    if result['broadcaster_duplicates'] > 0:
-        print("Removing duplicate broadcasters...")
-        removed = db.remove_duplicate_broadcasters()
-        print(f"✓ Removed {removed} duplicate broadcasters")
+    print(f"✓ Removed {fixtures_removed} duplicate fixtures")
+    print(f"✓ Removed {broadcasters_removed} duplicate broadcasters")
     
     print("\n✓ Database cleanup complete!")
-    print("="*80 + "\n")
-    db.close()
+    print(f"{_BAR}\n")
 
 
 def print_usage():
@@ -330,6 +266,24 @@ Examples:
     """)
 
 
+# Commands that take no arguments
+COMMANDS = {
+    'scrape': scrape_fixtures,
+    'today': query_today,
+    'tomorrow': query_tomorrow,
+    'stats': show_stats,
+    'check': check_duplicates,
+    'clean': clean_database,
+}
+
+# Commands that need a name: handler for the remaining arguments, and what
+# to ask for when there are none
+COMMANDS_WITH_ARGS = {
+    'country': (lambda args: query_country(args[0]), 'a country name'),
+    'competition': (lambda args: query_competition(' '.join(args)), 'a competition name'),
+}
+
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
@@ -338,31 +292,21 @@ def main():
     
     command = sys.argv[1].lower()
     
-    if command == 'scrape':
-        scrape_fixtures()
-    elif command == 'today':
-        query_today()
-    elif command == 'tomorrow':
-        query_tomorrow()
-    elif command == 'country':
-        if len(sys.argv) < 3:
-            print("Error: Please specify a country name")
-            return
-        query_country(sys.argv[2])
-    elif command == 'competition':
+    handler = COMMANDS.get(command)
+    if handler:
+        handler()
+        return
+    
+    if command in COMMANDS_WITH_ARGS:
+        handler, argument = COMMANDS_WITH_ARGS[command]
         if len(sys.argv) < 3:
-            print("Error: Please specify a competition name")
+            print(f"Error: Please specify {argument}")
             return
-        query_competition(' '.join(sys.argv[2:]))
-    elif command == 'stats':
-        show_stats()
-    elif command == 'check':
-        check_duplicates()
-    elif command == 'clean':
-        clean_database()
-    else:
-        print(f"Unknown command: {command}")
-        print_usage()
+        handler(sys.argv[2:])
+        return
+    
+    print(f"Unknown command: {command}")
+    print_usage()
 
 
 if __name__ == "__main__":